@@ -126,7 +126,7 @@ class CSUSBLibraryClient(ILibraryClient):
             }
             facet_value = type_facets.get(resource_type.lower(), resource_type.lower())
             params["qInclude"] = f"facet_rtype,exact,{facet_value}"
-            _log.info(f"Adding resource type filter: {params['qInclude']}")
+            _log.info("Adding resource type filter: %s", params["qInclude"])
 
         # Add date range filter if specified (year or YYYYMMDD accepted)
         if date_from is not None or date_to is not None:
@@ -138,17 +138,17 @@ class CSUSBLibraryClient(ILibraryClient):
             today = _get_today_yyyymmdd()
             try:
                 if end_str and end_str.isdigit() and int(end_str) > int(today):
-                    _log.info(f"Clamping end date {end_str} to today {today}")
+                    _log.info("Clamping end date %s to today %s", end_str, today)
                     end_str = today
                 if start_str and start_str.isdigit() and int(start_str) > int(today):
-                    _log.info(f"Clamping start date {start_str} to today {today}")
+                    _log.info("Clamping start date %s to today %s", start_str, today)
                     start_str = today
                 # Swap if start > end
                 if start_str and end_str and start_str.isdigit() and end_str.isdigit() and int(start_str) > int(end_str):
-                    _log.info(f"Swapping start/end dates: {start_str} > {end_str}")
+                    _log.info("Swapping start/end dates: %s > %s", start_str, end_str)
                     start_str, end_str = end_str, start_str
             except Exception as e:
-                _log.error(f"Error processing date range: {e}")
+                _log.error("Error processing date range: %s", e)
 
             # Append date filter to the q parameter
             params_q = params.get("q", "")
@@ -156,7 +156,7 @@ class CSUSBLibraryClient(ILibraryClient):
                 params_q = params_q.rstrip(";")
             date_segment = f"dr_s,exact,{start_str},AND;dr_e,exact,{end_str};"
             params["q"] = params_q + ";" + date_segment if params_q else date_segment
-            _log.info(f"Adding date range filter to q: {params['q']}")
+            _log.info("Adding date range filter to q: %s", params["q"])
         
         r = self.session.get(url, params=params, timeout=self.timeout)
         _log.info("Primo explore_search URL: %s", r.url)
@@ -169,7 +169,7 @@ class CSUSBLibraryClient(ILibraryClient):
         # Log response info
         doc_count = len(data.get("docs", []))
         total = data.get("info", {}).get("total", 0)
-        _log.info(f"Primo returned {doc_count} docs out of {total} total results")
+        _log.info("Primo returned %d docs out of %s total results", doc_count, total)
         
         return data
 
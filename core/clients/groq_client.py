@@ -144,6 +144,7 @@ class GroqClient(ILLMClient):
         if extra:
             payload.update(extra)
 
+        stream = None
         try:
             stream = self._client.chat.completions.create(**payload)
             for chunk in stream:
@@ -156,4 +157,9 @@ class GroqClient(ILLMClient):
                 if delta and getattr(delta, "content", None):
                     yield delta.content
         except Exception as e:
-            raise RuntimeError(f"Groq chat_stream() failed: {e}") from e
\ No newline at end of file
+            raise RuntimeError(f"Groq chat_stream() failed: {e}") from e
+        finally:
+            # Release the HTTP connection when the caller stops reading early
+            close = getattr(stream, "close", None)
+            if callable(close):
+                close()
\ No newline at end of file
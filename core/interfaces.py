@@ -46,7 +46,12 @@ class ILibraryClient(ABC):
 
 # Interface for prompt providers
 class IPromptProvider(ABC):
-    """Interface for providing AI prompts."""
+    """Interface for providing AI prompts.
+    
+    Prompts must keep their static text as a stable prefix and put
+    per-request content (conversation text, queries) at the end, so LLM
+    providers with prompt caching can reuse the prefix between calls.
+    """
     
     @abstractmethod
     def get_follow_up_prompt(self) -> str:
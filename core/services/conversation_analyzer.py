@@ -2,43 +2,268 @@
 Conversation analysis service for extracting search intent.
 Follows SRP - Single Responsibility: Analyze user conversations.
 """
+import calendar
+import copy
 import json
-from typing import Dict, List, Optional
+import re
+import time
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional
 from core.interfaces import ILLMClient, IPromptProvider
-from core.utils.dates import extract_dates_from_text
+from core.utils.cache import LRUCache, text_digest
+from core.utils.dates import _get_today_yyyymmdd, extract_dates_from_text
 from core.utils.logging_utils import get_logger
+from core.utils.patterns import PriorityPatterns, keyword_alternation
+try:
+    # orjson parses the small extraction payloads several times faster
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 # Keep heuristics in ConversationAnalyzer (SRP). Shared normalization lives in core.utils.dates
 
 logger = get_logger(__name__)
 
+# Every limit pattern needs a number, so digit-free text can skip them all
+_DIGIT_RE = re.compile(r"\d")
+
+# Count patterns like "5 articles", "find 3 books", "I need 10 papers"
+_LIMIT_PATTERNS = (
+    re.compile(r'\b(\d+)\s+(?:articles|books|journals|papers|thesis|theses|dissertations|results)'),
+    re.compile(r'(?:find|get|show|need|want)\s+(\d+)'),
+    re.compile(r'(\d+)\s+(?:of|for)'),
+)
+_LIMIT_SEARCH = PriorityPatterns(_LIMIT_PATTERNS)
+
+# Whole-message refinements: "only 2020", "2015 to 2020", "last 3 years"
+_YEAR_ONLY_RE = re.compile(r'^\s*(only|just)?\s*\d{4}\s*$')
+_YEAR_RANGE_ONLY_RE = re.compile(r'^\s*\d{4}\s*(to|-)\s*\d{4}\s*$')
+_LAST_YEARS_ONLY_RE = re.compile(r'^\s*(last|past)\s+\d+\s+years?\s*$')
+
+# Shared result for date replies that mention no date; read-only so callers can't mutate it
+_EMPTY_DATES = MappingProxyType({"date_from": None, "date_to": None})
+
+# Topic phrase after "about"/"on"/"regarding", stopping at a date qualifier
+_TOPIC_RE = re.compile(
+    r"\b(?:about|on|regarding)\s+(.+?)"
+    r"(?=\s+(?:from|since|between|during|published|last|past|in\s+\d{4})\b|[.?!]|$)"
+)
+
+# What may precede the topic phrase: request verbs, a count and resource nouns
+_TOPIC_HEAD_RE = re.compile(
+    r"(?:\s*\b(?:\d+|i|need|want|find|get|show|give|me|search|look|for|some|please|"
+    r"peer[- ]reviewed|scholarly|academic|articles?|journals?|papers?|e?books?|"
+    r"theses|thesis|dissertations?|results)\b)*\s*"
+)
+
+# What may follow the topic phrase: exactly one date qualifier, then end of message
+_TOPIC_TAIL_RE = re.compile(
+    r"\s*(?:published\s+)?(?:"
+    r"from\s+\d{4}\s*(?:to|-|until|through)\s*\d{4}|between\s+\d{4}\s+and\s+\d{4}|"
+    r"(?:from|since|in|during)\s+\d{4}|(?:last|past)\s+(?:\d{1,2}\s+)?(?:years?|months?)"
+    r")\s*[.?!]*\s*"
+)
+
+# Topics made only of these words say nothing about what to search for
+_TOPIC_STOPWORDS = frozenset({
+    "the", "a", "an", "this", "that", "these", "those", "it", "them", "some",
+    "any", "all", "more", "other", "something", "stuff", "things", "topic", "topics",
+})
+
+# Exclusions and logical operators need the LLM to become a real query
+_TOPIC_OPERATORS = frozenset({
+    "not", "no", "nor", "without", "exclude", "excluding", "except", "but", "or",
+})
+
+
+def _normalize_year(date_str: str, is_start: bool) -> str:
+    """Expand YYYY to Jan 1st, or to Dec 31st / today for an end bound."""
+    if is_start:
+        return f"{date_str}0101"  # January 1st
+    # For end date, use today's (UTC) date if it's current year, otherwise Dec 31
+    today = _get_today_yyyymmdd()
+    if int(date_str) >= int(today[:4]):
+        return today
+    return f"{date_str}1231"  # December 31st
+
+
+def _normalize_year_month(date_str: str, is_start: bool) -> Optional[str]:
+    """Expand YYYYMM to the first or last day of that month, or None for an invalid month."""
+    month = int(date_str[4:6])
+    if not 1 <= month <= 12:
+        return None
+    if is_start:
+        return f"{date_str}01"  # First day of month
+    # Last day of month (leap years included)
+    last_day = calendar.monthrange(int(date_str[:4]), month)[1]
+    return f"{date_str}{last_day:02d}"
+
+
+def _normalize_full_date(date_str: str, is_start: bool) -> str:
+    """YYYYMMDD is already normalized."""
+    return date_str
+
+
+# _normalize_date_param handlers keyed by digit count
+_DATE_NORMALIZERS = {4: _normalize_year, 6: _normalize_year_month, 8: _normalize_full_date}
+
+
+@lru_cache(maxsize=1024)
+def _cached_extract_dates(text: str, utc_day: int, lowered: bool = False) -> tuple[Optional[int], Optional[int]]:
+    """Memoized date extraction; utc_day keys out relative phrases like "last month"."""
+    return extract_dates_from_text(text, lowered=lowered)
+
+
+class ConversationView:
+    """Read-only views of a conversation history, each built at most once.
+    
+    Created once per extraction and handed to the helpers so they share
+    the joined texts instead of rebuilding them from the history.
+    """
+    
+    def __init__(self, conversation_history: List[Dict]):
+        """Wrap a conversation history without copying it."""
+        self.history = conversation_history
+    
+    @cached_property
+    def _parts(self) -> tuple[List[str], List[str]]:
+        """Transcript lines and user contents, collected in a single pass."""
+        lines = []
+        user_messages = []
+        for msg in self.history:
+            role, content = msg["role"], msg["content"]
+            lines.append(f"{role}: {content}")
+            if role == "user":
+                user_messages.append(content)
+        return lines, user_messages
+    
+    @cached_property
+    def full_text(self) -> str:
+        """All messages as "role: content" lines."""
+        return "\n".join(self._parts[0])
+    
+    @cached_property
+    def full_text_lower(self) -> str:
+        """Lowercased full_text, computed on first use."""
+        return self.full_text.lower()
+    
+    @property
+    def user_messages(self) -> List[str]:
+        """Contents of the user messages, oldest first."""
+        return self._parts[1]
+    
+    @cached_property
+    def user_text(self) -> str:
+        """User message contents joined by newlines."""
+        return "\n".join(self.user_messages)
+    
+    @property
+    def last_user_message(self) -> Optional[str]:
+        """The most recent user message, or None if there is none."""
+        user_messages = self.user_messages
+        return user_messages[-1] if user_messages else None
+
 
 class ConversationAnalyzer:
     """Analyzes conversation to determine search readiness and extract parameters."""
     
     # Keywords that indicate user wants to search immediately
-    SEARCH_TRIGGER_KEYWORDS = [
+    SEARCH_TRIGGER_KEYWORDS = (
         "search now", "find articles", "show me", "search for", 
         "look for", "get articles", "retrieve", "fetch", "give me",
         "find me", "get me"
-    ]
+    )
     
     # Additional trigger patterns that indicate search intent
-    SEARCH_VERBS = ["i need", "i want", "get me", "give me", "find me"]
-    RESOURCE_TYPES = ["article", "book", "journal", "thesis"]
+    SEARCH_VERBS = ("i need", "i want", "get me", "give me", "find me")
+    RESOURCE_TYPES = ("article", "book", "journal", "thesis")
+    
+    # One trie-factored alternation per keyword group: a single scan replaces
+    # one substring search per keyword, and shared prefixes are tested once.
+    # Any verb followed (anywhere later) by a resource word counts, so the
+    # verb/resource check is one regex as well.
+    _TRIGGER_RE = re.compile(keyword_alternation(SEARCH_TRIGGER_KEYWORDS))
+    _VERB_RESOURCE_RE = re.compile(
+        f"(?:{keyword_alternation(SEARCH_VERBS)}).*?(?:{keyword_alternation(RESOURCE_TYPES)})",
+        re.DOTALL
+    )
+    # Shorter inputs cannot contain any trigger keyword or verb + resource pair
+    _MIN_TRIGGER_LEN = min(map(len, SEARCH_TRIGGER_KEYWORDS))
+    
+    # Whole-word resource nouns; the named group that matched is the type
+    _RESOURCE_TYPE_RE = re.compile(
+        r"\b(?:(?P<article>articles?|journals?)|(?P<book>e?books?)|(?P<thesis>theses|thesis|dissertations?))\b"
+    )
     
     # Keywords that indicate search refinement
-    REFINEMENT_KEYWORDS = [
+    REFINEMENT_KEYWORDS = (
         "only", "just", "filter", "narrow", "refine", "change to",
         "instead", "from", "between", "published in", "in year"
-    ]
+    )
     
     # Off-topic/meta question patterns that should be redirected
-    OFF_TOPIC_PATTERNS = [
+    OFF_TOPIC_PATTERNS = (
         "how many", "tell me", "what is", "who is", "where is", "when is",
         "why is", "can you", "could you", "would you", "do you have",
         "are there", "is there", "how are", "how do", "what are",
         "help me", "thank you", "thanks", "hello", "hi there", "hey"
-    ]
+    )
+    
+    # Questions about the system/results rather than research topics
+    META_PHRASES = (
+        "more do you have", "many results", "show me more", "more results",
+        "can you show", "do you know", "are you", "what can you"
+    )
+    
+    # Words that give a short question research context
+    RESEARCH_KEYWORDS = (
+        "research", "study", "article", "paper", "book", "thesis",
+        "journal", "publication", "find", "search", "looking for"
+    )
+    
+    # Metadata question patterns and result-related keywords
+    METADATA_PATTERNS = (
+        "how many", "total", "count", "number of", "all the results",
+        "show all", "display all", "list all", "what's the",
+        "more do you have", "many results", "many more", "how much"
+    )
+    RESULT_KEYWORDS = ("result", "results", "article", "articles", "record", "records")
+    
+    # Single-scan equivalents of any(keyword in text) for the groups above
+    _REFINEMENT_RE = re.compile(keyword_alternation(REFINEMENT_KEYWORDS))
+    _META_RE = re.compile(keyword_alternation(META_PHRASES))
+    _RESEARCH_RE = re.compile(keyword_alternation(RESEARCH_KEYWORDS))
+    _METADATA_RE = re.compile(keyword_alternation(METADATA_PATTERNS))
+    _RESULT_RE = re.compile(keyword_alternation(RESULT_KEYWORDS))
+    
+    # Clarification answers that name a resource type rather than a topic
+    RESOURCE_TYPE_PHRASES = frozenset({
+        "articles", "article", "books", "book", "thesis", "theses",
+        "peer reviewed articles", "peer reviewed journals", "peer-reviewed articles",
+        "peer-reviewed journals", "journal articles", "research articles",
+        "research papers", "scholarly articles", "academic articles",
+        "any type", "any", "journals", "journal", "ebooks", "e-books",
+        "dissertations", "dissertation"
+    })
+    
+    # Query prefixes that mark a refinement phrase rather than a new topic
+    REFINEMENT_ONLY_PHRASES = ("only", "just", "filter", "narrow", "refine", "change", "instead")
+    
+    # Short answers that must not replace the previous query
+    SIMPLE_ANSWERS = frozenset({"articles", "article", "books", "book", "thesis", "any type", "any"})
+    
+    # Fields a refinement may override when the LLM returns a non-null value
+    MERGEABLE_FIELDS = frozenset({"resource_type", "limit", "date_from", "date_to"})
+    
+    # Normalized extraction results keyed by UTC day, LLM provider, prompt and
+    # conversation digest. Shared across instances because the UI builds a
+    # fresh analyzer for every user turn.
+    _params_cache = LRUCache(maxsize=512)
+    
+    # Follow-up replies keyed by system prompt and transcript digest, so a
+    # rerun or a conversation that converges on the same turns skips the LLM
+    _follow_up_cache = LRUCache(maxsize=512)
     
     def __init__(self, llm_client: ILLMClient, prompt_provider: IPromptProvider):
         """Initialize with dependencies (Dependency Injection)."""
@@ -49,25 +274,18 @@ class ConversationAnalyzer:
         """Check if user input is an off-topic or meta question that should be redirected."""
         user_input_lower = user_input.lower().strip()
         
-        # Check for off-topic patterns
-        for pattern in self.OFF_TOPIC_PATTERNS:
-            if user_input_lower.startswith(pattern):
-                return True
+        # Check for off-topic patterns (str.startswith accepts the whole tuple)
+        if user_input_lower.startswith(self.OFF_TOPIC_PATTERNS):
+            return True
         
         # Check for questions about the system/results rather than research topics
-        meta_phrases = [
-            "more do you have", "many results", "show me more", "more results",
-            "can you show", "do you know", "are you", "what can you"
-        ]
-        if any(phrase in user_input_lower for phrase in meta_phrases):
+        if self._META_RE.search(user_input_lower):
             return True
         
         # Check if it's a question without any research-related keywords
         if "?" in user_input and len(user_input.split()) < 8:
             # Short questions without research context are likely off-topic
-            research_keywords = ["research", "study", "article", "paper", "book", "thesis", 
-                               "journal", "publication", "find", "search", "looking for"]
-            if not any(keyword in user_input_lower for keyword in research_keywords):
+            if not self._RESEARCH_RE.search(user_input_lower):
                 return True
         
         return False
@@ -76,79 +294,112 @@ class ConversationAnalyzer:
         """Check if user is asking about metadata or search result statistics."""
         user_input_lower = user_input.lower().strip()
         
-        # Metadata question patterns
-        metadata_patterns = [
-            "how many", "total", "count", "number of", "all the results",
-            "show all", "display all", "list all", "what's the",
-            "more do you have", "many results", "many more", "how much"
-        ]
-        
-        # Result-related keywords
-        result_keywords = ["result", "results", "article", "articles", "record", "records"]
-        
         # Check if it's asking about metadata
-        has_metadata_pattern = any(pattern in user_input_lower for pattern in metadata_patterns)
-        has_result_keyword = any(keyword in user_input_lower for keyword in result_keywords)
+        if not self._METADATA_RE.search(user_input_lower):
+            return False
         
-        # It's a metadata question if it has both patterns
-        return has_metadata_pattern and (has_result_keyword or len(user_input.split()) < 8)
+        # It's a metadata question if it also mentions results or is short
+        return self._RESULT_RE.search(user_input_lower) is not None or len(user_input.split()) < 8
     
     def should_trigger_search(self, user_input: str) -> bool:
         """Check if user explicitly wants to trigger a search."""
+        if len(user_input) < self._MIN_TRIGGER_LEN:
+            return False
         user_input_lower = user_input.lower()
         
         # Check simple trigger keywords
-        if any(keyword in user_input_lower for keyword in self.SEARCH_TRIGGER_KEYWORDS):
+        if self._TRIGGER_RE.search(user_input_lower):
             return True
         
         # Check for verb + resource type pattern (e.g., "I need books", "I want articles")
-        for verb in self.SEARCH_VERBS:
-            if verb in user_input_lower:
-                # Check if any resource type appears after the verb
-                verb_pos = user_input_lower.find(verb)
-                text_after_verb = user_input_lower[verb_pos:]
-                if any(resource in text_after_verb for resource in self.RESOURCE_TYPES):
-                    return True
-        
-        return False
+        return self._VERB_RESOURCE_RE.search(user_input_lower) is not None
     
     def is_refinement_query(self, user_input: str) -> bool:
         """Detect if user is trying to refine/filter existing search results."""
         user_input_lower = user_input.lower().strip()
         
         # Check for refinement keywords
-        if any(keyword in user_input_lower for keyword in self.REFINEMENT_KEYWORDS):
+        if self._REFINEMENT_RE.search(user_input_lower):
             return True
         
         # Check for year-only patterns (e.g., "2022", "only 2020", "just 2019")
-        import re
-        year_only_pattern = r'^\s*(only|just)?\s*\d{4}\s*$'
-        if re.match(year_only_pattern, user_input_lower):
+        if _YEAR_ONLY_RE.match(user_input_lower):
             return True
         
         # Check for date range patterns without topic keywords
-        date_range_pattern = r'^\s*\d{4}\s*(to|-)\s*\d{4}\s*$'
-        if re.match(date_range_pattern, user_input_lower):
+        if _YEAR_RANGE_ONLY_RE.match(user_input_lower):
             return True
         
         # Check for "last N years" patterns
-        last_years_pattern = r'^\s*(last|past)\s+\d+\s+years?\s*$'
-        if re.match(last_years_pattern, user_input_lower):
+        if _LAST_YEARS_ONLY_RE.match(user_input_lower):
             return True
         
         return False
     
+    @staticmethod
+    def _follow_up_key(system_prompt: str, conversation_history: List[Dict]) -> bytes:
+        """Cache key for a follow-up reply to this exact prompt and transcript."""
+        return text_digest(f"{system_prompt}\n\n{ConversationView(conversation_history).full_text}")
+    
+    def _params_key(self, prompt: str, conversation_text: str) -> bytes:
+        """Cache key for parameters extracted from this prompt and conversation today.
+        
+        Normalized dates depend on the clock ("last month", end bounds capped
+        at today), so entries expire with the UTC day, matching the date
+        extraction memo. The client class and model keep one provider from
+        being served another's results; the rendered prompt covers the template.
+        """
+        utc_day = int(time.time()) // 86400
+        provider = f"{type(self.llm_client).__qualname__}:{getattr(self.llm_client, 'model', '')}"
+        return text_digest(f"{utc_day}\n{provider}\n{prompt}\n\n{conversation_text}")
+    
     def get_follow_up_response(self, conversation_history: List[Dict]) -> str:
         """Generate a follow-up question or indicate search readiness."""
         try:
             system_prompt = self.prompt_provider.get_follow_up_prompt()
-            messages = [{"role": msg["role"], "content": msg["content"]} for msg in conversation_history]
-            response = self.llm_client.chat(messages, system=system_prompt)
+            cache_key = self._follow_up_key(system_prompt, conversation_history)
+            cached = self._follow_up_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Follow-up response cache hit")
+                return cached
+            # Chat messages only carry role/content and the client copies the
+            # list before adding the system prompt, so no rebuild is needed
+            response = self.llm_client.chat(conversation_history, system=system_prompt)
+            self._follow_up_cache.set(cache_key, response)
             return response
         except Exception as e:
             logger.error(f"Error generating follow-up question: {e}")
             return "What research topic would you like to explore today?"
     
+    def stream_follow_up_response(self, conversation_history: List[Dict]) -> Iterator[str]:
+        """Stream a follow-up question or search readiness as text chunks.
+        
+        Lets the UI render the first tokens as soon as the model produces
+        them. Closing the iterator early also closes the underlying stream.
+        A fully streamed reply is cached and replayed as a single chunk.
+        """
+        produced = False
+        try:
+            system_prompt = self.prompt_provider.get_follow_up_prompt()
+            cache_key = self._follow_up_key(system_prompt, conversation_history)
+            cached = self._follow_up_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Follow-up response cache hit")
+                yield cached
+                return
+            chunks = []
+            for chunk in self.llm_client.chat_stream(conversation_history, system=system_prompt):
+                produced = True
+                chunks.append(chunk)
+                yield chunk
+            if chunks:
+                # Stored stripped, exactly as the chat() path returns replies
+                self._follow_up_cache.set(cache_key, "".join(chunks).strip())
+        except Exception as e:
+            logger.error(f"Error streaming follow-up question: {e}")
+            if not produced:
+                yield "What research topic would you like to explore today?"
+    
     def extract_search_parameters(self, conversation_history: List[Dict], previous_params: Optional[Dict] = None) -> Dict[str, any]:
         """Extract search query, limit, and resource type from conversation.
         
@@ -159,54 +410,29 @@ class ConversationAnalyzer:
         Returns:
             Dict with search parameters
         """
+        view = ConversationView(conversation_history)
         try:
-            # Build conversation text
-            conversation_text = "\n".join([
-                f"{msg['role']}: {msg['content']}" 
-                for msg in conversation_history
-            ])
+            conversation_text = view.full_text
             
-            # Get extraction prompt
+            # Reuse a previous extraction for an identical conversation today
             prompt = self.prompt_provider.get_parameter_extraction_prompt(conversation_text)
-            
-            # Get LLM response
-            response = self.llm_client.chat(prompt)
-            
-            # Parse JSON - handle potential errors
-            try:
-                params = json.loads(response)
-                
-                # Ensure it's a dict, not a list or other type
-                if not isinstance(params, dict):
-                    logger.warning(f"LLM returned non-dict response: {type(params)}. Using fallback.")
-                    return self._fallback_extraction(conversation_history, previous_params)
-                    
-            except json.JSONDecodeError as je:
-                logger.error(f"JSON decode error: {je}. Response was: {response[:200]}")
-                return self._fallback_extraction(conversation_history, previous_params)
-            
-            # Normalize and ensure date fields exist
-            date_from = params.get("date_from") if isinstance(params, dict) else None
-            date_to = params.get("date_to") if isinstance(params, dict) else None
-            
-            # Convert dates to proper YYYYMMDD string format if they're integers or years
-            date_from = self._normalize_date_param(date_from, is_start=True)
-            date_to = self._normalize_date_param(date_to, is_start=False)
-            
-            params["date_from"] = date_from
-            params["date_to"] = date_to
-            
-            # If LLM did not provide dates, attempt heuristic extraction from text
-            if params.get("date_from") is None and params.get("date_to") is None:
-                d_from, d_to = self._extract_dates_from_text(conversation_text)
-                if d_from is not None:
-                    params["date_from"] = self._normalize_date_param(d_from, is_start=True)
-                if d_to is not None:
-                    params["date_to"] = self._normalize_date_param(d_to, is_start=False)
+            cache_key = self._params_key(prompt, conversation_text)
+            cached = self._params_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Parameter extraction cache hit")
+                params = copy.deepcopy(cached)
+            else:
+                # Refinements need the LLM's judgement; complete new requests may not
+                params = None if previous_params else self._try_heuristic_extraction(conversation_history, view)
+                if params is None:
+                    params = self._extract_with_llm(conversation_text, view, prompt)
+                if params is None:
+                    return self._fallback_extraction(conversation_history, previous_params, view)
+                self._params_cache.set(cache_key, copy.deepcopy(params))
             
             # Merge with previous parameters if provided (for refinements)
             if previous_params:
-                params = self._merge_with_previous(params, previous_params, conversation_history)
+                params = self._merge_with_previous(params, previous_params, conversation_history, view)
             
             logger.info(f"Extracted parameters: {params}")
             return params
@@ -214,18 +440,142 @@ class ConversationAnalyzer:
         except Exception as e:
             logger.error(f"Error extracting search parameters: {e}")
             # Fallback: use last user message
-            return self._fallback_extraction(conversation_history, previous_params)
+            return self._fallback_extraction(conversation_history, previous_params, view)
     
-    def _fallback_extraction(self, conversation_history: List[Dict], previous_params: Optional[Dict] = None) -> Dict[str, any]:
+    def _extract_with_llm(self, conversation_text: str, view: Optional[ConversationView] = None,
+                          prompt: Optional[str] = None) -> Optional[Dict[str, any]]:
+        """Ask the LLM for search parameters and normalize its JSON answer.
+        
+        Args:
+            conversation_text: Transcript sent to the LLM
+            view: View of the same conversation, reused for its lowered text
+            prompt: Extraction prompt for conversation_text, if already rendered
+        
+        Returns:
+            Dict with normalized parameters, or None if the response was unusable
+        """
+        # Get extraction prompt
+        if prompt is None:
+            prompt = self.prompt_provider.get_parameter_extraction_prompt(conversation_text)
+        
+        # Get LLM response
+        response = self.llm_client.chat(prompt)
+        
+        # Parse JSON - handle potential errors
+        try:
+            params = _json_loads(response)
+        except ValueError as je:
+            # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+            logger.error(f"JSON decode error: {je}. Response was: {response[:200]}")
+            return None
+        
+        # Ensure it's a dict, not a list or other type
+        if not isinstance(params, dict):
+            logger.warning(f"LLM returned non-dict response: {type(params)}. Using fallback.")
+            return None
+        
+        # Normalize and ensure date fields exist
+        date_from = params.get("date_from")
+        date_to = params.get("date_to")
+        
+        # Convert dates to proper YYYYMMDD string format if they're integers or years
+        date_from = self._normalize_date_param(date_from, is_start=True)
+        date_to = self._normalize_date_param(date_to, is_start=False)
+        
+        params["date_from"] = date_from
+        params["date_to"] = date_to
+        
+        # If LLM did not provide dates, attempt heuristic extraction from text
+        if params.get("date_from") is None and params.get("date_to") is None:
+            if view is not None:
+                d_from, d_to = self._extract_dates_from_text(view.full_text_lower, lowered=True)
+            else:
+                d_from, d_to = self._extract_dates_from_text(conversation_text)
+            if d_from is not None:
+                params["date_from"] = self._normalize_date_param(d_from, is_start=True)
+            if d_to is not None:
+                params["date_to"] = self._normalize_date_param(d_to, is_start=False)
+        
+        return params
+    
+    def _try_heuristic_extraction(self, conversation_history: List[Dict],
+                                  view: Optional[ConversationView] = None) -> Optional[Dict[str, any]]:
+        """Extract parameters without the LLM when the last request is unambiguous.
+        
+        Only fires when the last user message triggers a search and explicitly
+        states a count, resource type, date bound and "about <topic>" phrase.
+        
+        Returns:
+            Dict with normalized parameters, or None if any field is uncertain
+        """
+        view = view or ConversationView(conversation_history)
+        last_message = view.last_user_message
+        if last_message is None or not self.should_trigger_search(last_message):
+            return None
+        
+        # Cheapest checks first; every miss hands over to the LLM
+        limit = self._find_explicit_limit(last_message)
+        if limit is None:
+            return None
+        resource_type = self._extract_resource_type_heuristic(last_message)
+        if resource_type is None:
+            return None
+        d_from, d_to = self._extract_dates_from_text(last_message)
+        if d_from is None and d_to is None:
+            return None
+        query = self._extract_topic_heuristic(last_message)
+        if query is None:
+            return None
+        
+        logger.info("Heuristic extraction hit - skipping LLM")
+        return {
+            "query": query,
+            "limit": limit,
+            "resource_type": resource_type,
+            "date_from": self._normalize_date_param(d_from, is_start=True),
+            "date_to": self._normalize_date_param(d_to, is_start=False)
+        }
+    
+    def _extract_topic_heuristic(self, text: str) -> Optional[str]:
+        """Return the topic named after "about"/"on"/"regarding", if it looks clean.
+        
+        The words around the topic must be nothing but a request, count and
+        resource type before it and a single date qualifier after it, so no
+        part of the message is silently dropped from the search.
+        """
+        text_lower = text.lower()
+        match = _TOPIC_RE.search(text_lower)
+        if not match:
+            return None
+        if not _TOPIC_HEAD_RE.fullmatch(text_lower, 0, match.start()):
+            return None
+        if not _TOPIC_TAIL_RE.fullmatch(text_lower, match.end()):
+            return None
+        topic = match.group(1).strip(" ,;:")
+        words = topic.split()
+        # Numbers or very long phrases suggest the pattern overshot the topic;
+        # a single word or filler words alone are too vague to search without
+        # the LLM, and exclusions or "or" must not reach Primo word for word
+        if len(words) < 2 or len(words) > 8 or _DIGIT_RE.search(topic):
+            return None
+        if _TOPIC_STOPWORDS.issuperset(words) or not _TOPIC_OPERATORS.isdisjoint(words):
+            return None
+        return topic
+    
+    def _fallback_extraction(self, conversation_history: List[Dict], previous_params: Optional[Dict] = None,
+                             view: Optional[ConversationView] = None) -> Dict[str, any]:
         """Fallback parameter extraction when AI fails.
         
         Args:
             conversation_history: List of conversation messages
             previous_params: Previous search parameters to merge with
+            view: Prebuilt view of conversation_history, if the caller has one
         """
-        user_messages = [msg["content"] for msg in conversation_history if msg["role"] == "user"]
+        view = view or ConversationView(conversation_history)
+        user_messages = view.user_messages
         last_message = user_messages[-1] if user_messages else "research"
-        all_text = "\n".join(user_messages)
+        last_lower = last_message.lower()
+        all_text = view.user_text
         
         # Always check if this is a refinement query (don't gate on previous_params)
         is_refinement = self.is_refinement_query(last_message)
@@ -234,30 +584,23 @@ class ConversationAnalyzer:
             # For refinements with available previous params, merge them
             logger.info("Detected refinement query - merging with previous params")
             
-            # Extract dates from the refinement query
-            d_from, d_to = self._extract_dates_from_text(last_message)
-            d_from = self._normalize_date_param(d_from, is_start=True)
-            d_to = self._normalize_date_param(d_to, is_start=False)
-            
-            # Extract resource type if mentioned
-            resource_type = self._extract_resource_type_heuristic(last_message)
-            
-            # Extract limit if mentioned
-            limit = self._extract_limit_heuristic(last_message)
+            # Extract dates, resource type and limit from the refinement query
+            d_from, d_to, resource_type, limit = self._scan_all(last_lower, lowered=True)
             
             # Merge with previous params, only updating what was specified
-            refined_params = previous_params.copy()
-            
+            updates = {}
             if d_from is not None or d_to is not None:
-                refined_params["date_from"] = d_from
-                refined_params["date_to"] = d_to
+                updates["date_from"] = d_from
+                updates["date_to"] = d_to
             
             if resource_type is not None:
-                refined_params["resource_type"] = resource_type
+                updates["resource_type"] = resource_type
             
             # Only update limit if explicitly mentioned in refinement
-            if limit != 10 or any(word in last_message.lower() for word in ["limit", "results", "show"]):
-                refined_params["limit"] = limit
+            if limit != 10 or any(word in last_lower for word in ("limit", "results", "show")):
+                updates["limit"] = limit
+            
+            refined_params = {**previous_params, **updates}
             
             logger.info(f"Refined parameters: {refined_params}")
             return refined_params
@@ -268,35 +611,22 @@ class ConversationAnalyzer:
             # Look back for a substantial research topic in the conversation
             query = last_message
             
-            # Expanded list of resource type phrases to skip
-            resource_type_phrases = [
-                "articles", "article", "books", "book", "thesis", "theses",
-                "peer reviewed articles", "peer reviewed journals", "peer-reviewed articles",
-                "peer-reviewed journals", "journal articles", "research articles",
-                "research papers", "scholarly articles", "academic articles",
-                "any type", "any", "journals", "journal", "ebooks", "e-books",
-                "dissertations", "dissertation"
-            ]
-            
-            for i in range(len(user_messages) - 2, -1, -1):
-                msg = user_messages[i].strip()
-                msg_lower = msg.lower()
-                # Skip simple answers and refinement phrases
-                if (len(msg.split()) >= 3 and 
-                    not self.is_refinement_query(msg) and
-                    msg_lower not in resource_type_phrases):
-                    query = msg
-                    logger.info(f"Found research topic from conversation: {query}")
-                    break
+            topic = self._find_research_topic(user_messages, skip_refinements=True)
+            if topic is not None:
+                query = topic
+                logger.info(f"Found research topic from conversation: {query}")
             
             # Extract dates and other params from the refinement message
-            d_from, d_to = self._extract_dates_from_text(last_message)
+            d_from, d_to = self._extract_dates_from_text(last_lower, lowered=True)
             d_from = self._normalize_date_param(d_from, is_start=True)
             d_to = self._normalize_date_param(d_to, is_start=False)
             
-            # Get resource type and limit from full conversation
-            resource_type = self._extract_resource_type_heuristic(all_text)
-            limit = self._extract_limit_heuristic(all_text)
+            # Get resource type and limit from full conversation, lowered once
+            all_text_lower = all_text.lower()
+            resource_type = self._match_resource_type(all_text_lower)
+            limit = self._match_limit(all_text_lower)
+            if limit is None:
+                limit = 10  # Default
             
             return {
                 "query": query,
@@ -308,48 +638,22 @@ class ConversationAnalyzer:
         else:
             # Standard fallback for new searches
             # Check if last message is just a clarification answer (resource type, count, etc.)
-            last_lower = last_message.lower().strip()
-            
-            # Expanded list of resource type phrases that shouldn't be treated as queries
-            resource_type_phrases = [
-                "articles", "article", "books", "book", "thesis", "theses",
-                "peer reviewed articles", "peer reviewed journals", "peer-reviewed articles",
-                "peer-reviewed journals", "journal articles", "research articles",
-                "research papers", "scholarly articles", "academic articles",
-                "any type", "any", "journals", "journal", "ebooks", "e-books",
-                "dissertations", "dissertation"
-            ]
+            last_stripped = last_lower.strip()
             
             is_simple_answer = (
-                last_lower in resource_type_phrases or
-                last_lower.isdigit() or
-                # Check if it's purely a resource type specification (even with multiple words)
-                any(last_lower == phrase for phrase in resource_type_phrases)
+                last_stripped in self.RESOURCE_TYPE_PHRASES or
+                last_stripped.isdigit()
             )
             
             # If it's a simple answer, look back for the actual topic
             query = last_message
             if is_simple_answer and len(user_messages) > 1:
-                # Search backwards for a message that looks like a research topic
-                for i in range(len(user_messages) - 2, -1, -1):
-                    msg = user_messages[i].strip()
-                    msg_lower = msg.lower()
-                    # Skip simple answers and look for substantial topics
-                    if (len(msg.split()) >= 3 and 
-                        msg_lower not in resource_type_phrases and
-                        not msg_lower.startswith("i want to") and
-                        not msg_lower.startswith("i need") and
-                        "another research" not in msg_lower and
-                        "new search" not in msg_lower):
-                        query = msg
-                        logger.info(f"Found research topic in earlier message: {query}")
-                        break
+                topic = self._find_research_topic(user_messages, skip_refinements=False)
+                if topic is not None:
+                    query = topic
+                    logger.info(f"Found research topic in earlier message: {query}")
             
-            d_from, d_to = self._extract_dates_from_text(all_text)
-            d_from = self._normalize_date_param(d_from, is_start=True)
-            d_to = self._normalize_date_param(d_to, is_start=False)
-            resource_type = self._extract_resource_type_heuristic(all_text)
-            limit = self._extract_limit_heuristic(all_text)
+            d_from, d_to, resource_type, limit = self._scan_all(all_text)
 
             return {
                 "query": query,
@@ -359,33 +663,81 @@ class ConversationAnalyzer:
                 "date_to": d_to
             }
     
-    def _extract_resource_type_heuristic(self, text: str) -> Optional[str]:
-        """Extract resource type using simple keyword matching."""
-        text_lower = text.lower()
+    def _scan_all(self, text: str, lowered: bool = False) -> tuple[Optional[str], Optional[str], Optional[str], int]:
+        """Run the date, resource type and limit heuristics over one lowered copy of text.
         
-        # Check for each resource type keyword
-        # Order matters - check more specific terms first
-        if any(word in text_lower for word in ["journal articles", "peer reviewed articles", "research articles"]):
-            return "article"
-        if any(word in text_lower for word in ["articles", "article"]):
-            return "article"
-        if any(word in text_lower for word in ["journals", "journal", "peer reviewed journals"]):
-            return "article"  # journals map to article
-        if any(word in text_lower for word in ["books", "book", "ebooks", "ebook"]):
-            return "book"
-        if any(word in text_lower for word in ["thesis", "theses", "dissertation", "dissertations"]):
-            return "thesis"
+        Args:
+            text: Text to scan
+            lowered: True if text is already lowercase, so it is not lowered again
         
+        Returns:
+            Tuple (date_from, date_to, resource_type, limit) with dates as
+            YYYYMMDD strings and limit defaulting to 10
+        """
+        text_lower = text if lowered else text.lower()
+        d_from, d_to = self._extract_dates_from_text(text_lower, lowered=True)
+        resource_type = self._match_resource_type(text_lower)
+        limit = self._match_limit(text_lower)
+        return (
+            self._normalize_date_param(d_from, is_start=True),
+            self._normalize_date_param(d_to, is_start=False),
+            resource_type,
+            limit if limit is not None else 10
+        )
+    
+    def _find_research_topic(self, user_messages: List[str], skip_refinements: bool) -> Optional[str]:
+        """Walk earlier user messages backwards and return the latest substantive topic.
+        
+        Cheap length and phrase checks run first so the regex-based
+        refinement test only sees messages that could still qualify.
+        
+        Args:
+            user_messages: User message contents, oldest first (last one is skipped)
+            skip_refinements: Skip refinement phrases instead of new-search openers
+        """
+        for msg in reversed(user_messages[:-1]):
+            msg = msg.strip()
+            if len(msg.split()) < 3:
+                continue
+            msg_lower = msg.lower()
+            if msg_lower in self.RESOURCE_TYPE_PHRASES:
+                continue
+            if skip_refinements:
+                if self.is_refinement_query(msg):
+                    continue
+            elif (msg_lower.startswith(("i want to", "i need")) or
+                  "another research" in msg_lower or
+                  "new search" in msg_lower):
+                continue
+            return msg
         return None
     
-    def _merge_with_previous(self, new_params: Dict, previous_params: Dict, conversation_history: List[Dict]) -> Dict:
+    def _extract_resource_type_heuristic(self, text: str) -> Optional[str]:
+        """Extract resource type using simple keyword matching."""
+        return self._match_resource_type(text.lower())
+    
+    def _match_resource_type(self, text_lower: str) -> Optional[str]:
+        """Resource type keyword matching on already-lowercased text."""
+        # Articles (including journals) win over books, books over theses,
+        # wherever each appears in the text
+        best = None
+        for match in self._RESOURCE_TYPE_RE.finditer(text_lower):
+            kind = match.lastgroup
+            if kind == "article":
+                return kind
+            if best is None or kind == "book":
+                best = kind
+        return best
+    
+    def _merge_with_previous(self, new_params: Dict, previous_params: Dict, conversation_history: List[Dict],
+                             view: Optional[ConversationView] = None) -> Dict:
         """Merge new parameters with previous search parameters.
         
         Used when user is refining an existing search.
         """
         # Get the last user message to check for refinement
-        user_messages = [msg["content"] for msg in conversation_history if msg["role"] == "user"]
-        last_message = user_messages[-1] if user_messages else ""
+        view = view or ConversationView(conversation_history)
+        last_message = view.last_user_message or ""
         
         # Check if this looks like a refinement
         is_refinement = self.is_refinement_query(last_message)
@@ -402,64 +754,59 @@ class ConversationAnalyzer:
         
         logger.info(f"Merging refinement with previous params. Previous: {previous_params}")
         
-        # Start with previous params
-        merged = previous_params.copy()
-        
-        # Update only fields that were explicitly changed (not None)
-        # Check if query looks like a proper topic or just a refinement phrase
+        # Keep the new query only if it looks like a proper topic rather than
+        # a refinement phrase, a bare year or a simple answer like "articles"
         new_query_lower = str(new_query).strip().lower() if new_query else ""
-        refinement_only_phrases = ["only", "just", "filter", "narrow", "refine", "change", "instead"]
-        
-        # If query doesn't start with refinement phrases and isn't a bare year, update it
-        if new_query and not any(new_query_lower.startswith(phrase) for phrase in refinement_only_phrases):
-            # Check if it's not just a year
-            if not new_query_lower.isdigit() or len(new_query_lower) != 4:
-                # Also check it's not just a simple answer like "articles" or "books"
-                simple_answers = ["articles", "article", "books", "book", "thesis", "any type", "any"]
-                if new_query_lower not in simple_answers:
-                    merged["query"] = new_params["query"]
-        
-        # Update resource type only if it was explicitly provided (not None)
-        if new_params.get("resource_type") is not None:
-            merged["resource_type"] = new_params["resource_type"]
-        # If None, keep previous value (already in merged from copy)
-        
-        # Update limit only if it was explicitly provided (not None)
-        if new_params.get("limit") is not None:
-            merged["limit"] = new_params["limit"]
-        # If None, keep previous value (already in merged from copy)
-        
-        # Update dates if specified
-        if new_params.get("date_from") is not None:
-            merged["date_from"] = new_params["date_from"]
-        if new_params.get("date_to") is not None:
-            merged["date_to"] = new_params["date_to"]
+        keep_query = (
+            bool(new_query)
+            and not new_query_lower.startswith(self.REFINEMENT_ONLY_PHRASES)
+            and not (new_query_lower.isdigit() and len(new_query_lower) == 4)
+            and new_query_lower not in self.SIMPLE_ANSWERS
+        )
+        
+        # Update only fields that were explicitly provided (not None)
+        updates = {k: v for k, v in new_params.items() if v is not None and k in self.MERGEABLE_FIELDS}
+        if keep_query:
+            updates["query"] = new_query
+        merged = {**previous_params, **updates}
         
         logger.info(f"Merged parameters: {merged}")
         return merged
     
     def _extract_limit_heuristic(self, text: str) -> int:
         """Extract limit (number of results) using simple pattern matching."""
-        import re
-        
-        # Look for patterns like "5 articles", "find 3 books", "I need 10 papers"
-        patterns = [
-            r'\b(\d+)\s+(?:articles|books|journals|papers|thesis|theses|dissertations|results)',
-            r'(?:find|get|show|need|want)\s+(\d+)',
-            r'(\d+)\s+(?:of|for)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text.lower())
+        limit = self._find_explicit_limit(text)
+        return limit if limit is not None else 10  # Default
+    
+    def _find_explicit_limit(self, text: str) -> Optional[int]:
+        """Return the result count stated in the text, or None if there is none."""
+        if not _DIGIT_RE.search(text):
+            return None  # Skip lowering text that cannot contain a count
+        return self._match_limit(text.lower())
+    
+    def _match_limit(self, text_lower: str) -> Optional[int]:
+        """Limit pattern matching on already-lowercased text."""
+        if not _DIGIT_RE.search(text_lower):
+            return None
+        # One fused scan finds the first pattern (in priority order) that
+        # matches anywhere, exactly as trying them one by one would
+        found = _LIMIT_SEARCH.search(text_lower)
+        if found is None:
+            return None
+        first, match = found
+        limit = int(match.group(1))
+        if 1 <= limit <= 100:  # Reasonable range
+            return limit
+        
+        # Rare: out-of-range count, so lower-priority patterns get their turn
+        for pattern in _LIMIT_PATTERNS[first + 1:]:
+            match = pattern.search(text_lower)
             if match:
-                try:
-                    limit = int(match.group(1))
-                    if 1 <= limit <= 100:  # Reasonable range
-                        return limit
-                except (ValueError, IndexError):
-                    pass
-        
-        return 10  # Default
+                limit = int(match.group(1))
+                if 1 <= limit <= 100:
+                    return limit
+        
+        return None
 
     def _normalize_date_param(self, date_val, is_start: bool) -> Optional[str]:
         """Normalize date parameter to YYYYMMDD string format.
@@ -474,60 +821,38 @@ class ConversationAnalyzer:
         if date_val is None:
             return None
         
-        # Convert to string if it's an integer
+        # Convert to string if it's an integer, then dispatch on its length
         date_str = str(date_val)
-        
-        # If it's already 8 digits, return as-is
-        if len(date_str) == 8 and date_str.isdigit():
-            return date_str
-        
-        # If it's 4 digits (year only), expand to YYYYMMDD
-        if len(date_str) == 4 and date_str.isdigit():
-            if is_start:
-                return f"{date_str}0101"  # January 1st
-            else:
-                # For end date, use today's date if it's current year, otherwise Dec 31
-                from datetime import datetime
-                current_year = datetime.now().year
-                if int(date_str) >= current_year:
-                    return datetime.now().strftime("%Y%m%d")
-                else:
-                    return f"{date_str}1231"  # December 31st
-        
-        # If it's 6 digits (YYYYMM), expand to YYYYMMDD
-        if len(date_str) == 6 and date_str.isdigit():
-            if is_start:
-                return f"{date_str}01"  # First day of month
-            else:
-                # Last day of month
-                year = int(date_str[:4])
-                month = int(date_str[4:6])
-                if month in [1, 3, 5, 7, 8, 10, 12]:
-                    return f"{date_str}31"
-                elif month in [4, 6, 9, 11]:
-                    return f"{date_str}30"
-                else:  # February
-                    is_leap = (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
-                    return f"{date_str}29" if is_leap else f"{date_str}28"
+        if date_str.isdigit():
+            normalizer = _DATE_NORMALIZERS.get(len(date_str))
+            if normalizer is not None:
+                normalized = normalizer(date_str, is_start)
+                if normalized is not None:
+                    return normalized
         
         # If we can't parse it, return None
         logger.warning(f"Could not normalize date value: {date_val}")
         return None
     
-    def _extract_dates_from_text(self, text: str) -> tuple[Optional[int], Optional[int]]:
+    def _extract_dates_from_text(self, text: str, lowered: bool = False) -> tuple[Optional[int], Optional[int]]:
         """Delegate to shared utility for heuristic extraction.
 
         Returns tuple (date_from, date_to) where each value is an int (YYYY or YYYYMMDD)
         or None if not found.
         """
-        return extract_dates_from_text(text)
+        # Results are pure for a given text until the UTC day (used by the
+        # relative phrases in core.utils.dates) changes
+        return _cached_extract_dates(text, int(time.time()) // 86400, lowered)
 
-    def extract_date_parameters(self, text: str) -> dict:
+    def extract_date_parameters(self, text: str) -> Mapping[str, Optional[str]]:
         """Public helper to extract date_from/date_to from a short text reply.
 
-        Returns a dict: {"date_from": Optional[str], "date_to": Optional[str]} in YYYYMMDD format.
+        Returns a mapping: {"date_from": Optional[str], "date_to": Optional[str]} in YYYYMMDD format.
+        Replies without any date share one read-only empty result.
         """
         d_from, d_to = self._extract_dates_from_text(text)
+        if d_from is None and d_to is None:
+            return _EMPTY_DATES
         # Normalize to YYYYMMDD string format
         d_from = self._normalize_date_param(d_from, is_start=True)
         d_to = self._normalize_date_param(d_to, is_start=False)
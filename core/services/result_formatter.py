@@ -3,23 +3,54 @@ Result formatting service for library search results.
 Follows SRP - Single Responsibility: Format and parse search results.
 """
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from core.utils.logging_utils import get_logger
+from core.utils.patterns import keyword_alternation
 
 logger = get_logger(__name__)
 
+# Four-digit run not embedded in a longer number, for dates that do not start with one
+_YEAR_RE = re.compile(r"(?<!\d)\d{4}(?!\d)")
+
 
 class ResultFormatter:
     """Handles formatting and parsing of library search results."""
     
-    # Resource type mappings for filtering
+    # Resource type mappings for filtering (immutable, built once at import)
     RESOURCE_TYPE_MAPPINGS = {
-        "article": ["article", "journal article", "review"],
-        "book": ["book", "ebook", "electronic book"],
-        "journal": ["journal", "periodical"],
-        "thesis": ["thesis", "dissertation"],
+        "article": ("article", "journal article", "review"),
+        "book": ("book", "ebook", "electronic book"),
+        "journal": ("journal", "periodical"),
+        "thesis": ("thesis", "dissertation"),
+    }
+    
+    # One alternation per mapped type, so matching a document type is a single
+    # regex scan instead of one substring test per acceptable name
+    _TYPE_PATTERNS = {
+        resource_type: re.compile(keyword_alternation(names))
+        for resource_type, names in RESOURCE_TYPE_MAPPINGS.items()
+    }
+    
+    # Primo full-record URL; only the context and record id vary per document
+    _LINK_TEMPLATE = (
+        "https://csu-sb.primo.exlibrisgroup.com/discovery/fulldisplay"
+        "?context={context}"
+        "&vid=01CALS_USB:01CALS_USB"
+        "&search_scope=CSUSB_CSU_articles"
+        "&tab=CSUSB_CSU_Articles"
+        "&docid={docid}"
+    )
+    
+    # Everything before the record id, precomputed for the contexts Primo
+    # returns ("L" local, "PC" central index); other contexts use the template
+    _LINK_PREFIXES = {
+        "L": _LINK_TEMPLATE.format(context="L", docid=""),
+        "PC": _LINK_TEMPLATE.format(context="PC", docid=""),
     }
     
+    # Display table columns, in the order _table_row fills them
+    _TABLE_COLUMNS = ("#", "Title", "Authors", "Year", "Type", "Link")
+    
     @staticmethod
     def parse_document(doc: Dict[str, Any]) -> Dict[str, str]:
         """Parse a single document from Primo API response."""
@@ -90,9 +121,14 @@ class ResultFormatter:
         if not date or date == "N/A":
             date = ResultFormatter._get_first_value(addata, "date")
 
-        # Extract 4-digit year
+        # Extract 4-digit year; Primo dates nearly always lead with it, so the
+        # regex only runs for forms like "c2019" or "Spring 2020"
         if date and date != "N/A":
-            return date[:4]
+            year = date[:4]
+            if year.isdigit():
+                return year
+            match = _YEAR_RE.search(date)
+            return match.group() if match else year
         
         return "N/A"
     
@@ -103,54 +139,108 @@ class ResultFormatter:
         record_id = ResultFormatter._get_first_value(control, "recordid", "")
         
         if record_id and record_id != "N/A":
-            return (
-                f"https://csu-sb.primo.exlibrisgroup.com/discovery/fulldisplay"
-                f"?context={context}"
-                f"&vid=01CALS_USB:01CALS_USB"
-                f"&search_scope=CSUSB_CSU_articles"
-                f"&tab=CSUSB_CSU_Articles"
-                f"&docid={record_id}"
-            )
+            prefix = ResultFormatter._LINK_PREFIXES.get(context)
+            if prefix is None:
+                return ResultFormatter._LINK_TEMPLATE.format(context=context, docid=record_id)
+            return prefix + record_id
         return ""
     
     @staticmethod
-    def filter_by_resource_type(docs: List[Dict], resource_type: str) -> List[Dict]:
-        """Filter documents by resource type."""
+    def _type_pattern(resource_type: str) -> re.Pattern:
+        """Compiled matcher for the lowercase type names that count as resource_type."""
         resource_type_lower = resource_type.lower()
-        acceptable_types = ResultFormatter.RESOURCE_TYPE_MAPPINGS.get(
-            resource_type_lower, 
-            [resource_type_lower]
-        )
+        pattern = ResultFormatter._TYPE_PATTERNS.get(resource_type_lower)
+        if pattern is None:
+            # Unmapped types match themselves; re caches the compiled pattern
+            pattern = re.compile(re.escape(resource_type_lower))
+        return pattern
+    
+    @staticmethod
+    def _get_doc_type(doc: Dict[str, Any]) -> str:
+        """Lowercased display type of a raw document, as parse_document reports it.
+        
+        Reads only pnx.display.type, so filters can reject a document
+        without parsing the rest of it.
+        """
+        try:
+            types = doc["pnx"]["display"]["type"]
+        except KeyError:
+            return "n/a"
+        return types[0].lower() if isinstance(types, list) and types else "n/a"
+    
+    @staticmethod
+    def _matches_type(doc_type: str, type_pattern: re.Pattern) -> bool:
+        """Whether a lowercased document type contains any acceptable type name."""
+        return type_pattern.search(doc_type) is not None
+    
+    @staticmethod
+    def _table_row(idx: int, article: Dict[str, str]) -> Dict[str, Any]:
+        """One display row for a parsed document."""
+        link = article.get("link", "")
+        return {
+            "#": idx,
+            "Title": article["title"],
+            "Authors": article["author"],
+            "Year": article["date"],
+            "Type": article["type"],
+            "Link": link if link else None
+        }
+    
+    @staticmethod
+    def _iter_rows(docs: List[Dict], resource_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield display rows for docs, optionally filtered by resource type.
         
-        filtered = []
+        The type is checked before parsing, so each kept document is parsed
+        exactly once and rejected ones not at all.
+        """
+        type_pattern = ResultFormatter._type_pattern(resource_type) if resource_type else None
+        
+        idx = 0
         for doc in docs:
-            doc_data = ResultFormatter.parse_document(doc)
-            doc_type = doc_data.get("type", "").lower()
-            if any(acceptable in doc_type for acceptable in acceptable_types):
-                filtered.append(doc)
+            if type_pattern is not None and not ResultFormatter._matches_type(
+                ResultFormatter._get_doc_type(doc), type_pattern
+            ):
+                continue
+            idx += 1
+            yield ResultFormatter._table_row(idx, ResultFormatter.parse_document(doc))
+    
+    @staticmethod
+    def build_table(docs: List[Dict], resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Parse, optionally filter by resource type, and format documents in one pass.
         
-        return filtered
+        Equivalent to format_table_data(filter_by_resource_type(docs, resource_type))
+        but parses each document exactly once.
+        """
+        return list(ResultFormatter._iter_rows(docs, resource_type))
+    
+    @staticmethod
+    def build_columns(docs: List[Dict], resource_type: Optional[str] = None) -> Dict[str, List[Any]]:
+        """Like build_table, but return one list per column instead of one dict per row.
+        
+        Dataframe builders ingest a mapping of equal-length columns directly,
+        without scanning every row dict for its keys first.
+        """
+        columns = {name: [] for name in ResultFormatter._TABLE_COLUMNS}
+        appends = [(name, values.append) for name, values in columns.items()]
+        for row in ResultFormatter._iter_rows(docs, resource_type):
+            for name, append in appends:
+                append(row[name])
+        return columns
+    
+    @staticmethod
+    def filter_by_resource_type(docs: List[Dict], resource_type: str) -> List[Dict]:
+        """Filter documents by resource type.
+        
+        Args:
+            docs: Raw Primo documents
+            resource_type: Requested type, e.g. "article" or "book"
+        """
+        # Loop invariants are bound once; the body then runs on locals only
+        matches = ResultFormatter._type_pattern(resource_type).search
+        get_type = ResultFormatter._get_doc_type
+        return [doc for doc in docs if matches(get_type(doc))]
     
     @staticmethod
     def format_table_data(docs: List[Dict]) -> List[Dict[str, Any]]:
         """Format documents for table display."""
-        table_data = []
-        for idx, doc in enumerate(docs, 1):
-            article = ResultFormatter.parse_document(doc)
-            
-            title = article["title"]
-            
-            author = article["author"]
-            
-            link = article.get("link", "")
-            
-            table_data.append({
-                "#": idx,
-                "Title": title,
-                "Authors": author,
-                "Year": article["date"],
-                "Type": article["type"],
-                "Link": link if link else None
-            })
-        
-        return table_data
+        return ResultFormatter.build_table(docs)
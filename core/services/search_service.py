@@ -3,9 +3,14 @@
 Search service module for handling library searches and result processing.
 Refactored to follow SOLID principles with dependency injection.
 """
+import copy
+import threading
+import weakref
 from typing import Dict, Any, Optional, List
+from core.clients.csusb_library_client import CSUSBLibraryClient
 from core.interfaces import ILibraryClient
 from core.services.result_formatter import ResultFormatter
+from core.utils.cache import TTLCache
 from core.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +19,13 @@ logger = get_logger(__name__)
 class SearchService:
     """Service for performing library searches with proper separation of concerns."""
     
+    # Recent search results keyed by client identity and search parameters.
+    # Shared across instances because the legacy helpers build a service per
+    # search; the short TTL keeps results close to what the catalogue holds.
+    # Each entry keeps a weak reference to its client, so a new client that
+    # reuses a collected client's id() never sees the old client's results.
+    _results_cache = TTLCache(maxsize=256, ttl=60)
+    
     def __init__(self, library_client: ILibraryClient, formatter: ResultFormatter = None):
         """Initialize with dependencies (Dependency Injection)."""
         self.library_client = library_client
@@ -27,9 +39,26 @@ class SearchService:
         date_from: Optional[int] = None,
         date_to: Optional[int] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Perform search using the library client."""
+        """Perform search using the library client.
+        
+        Identical searches within a minute are answered from a cache; callers
+        always receive their own copy of the results.
+        """
+        cache_key = (
+            id(self.library_client),
+            query,
+            limit,
+            resource_type,
+            date_from,
+            date_to,
+        )
+        cached = self._results_cache.get(cache_key)
+        if cached is not None and cached[0]() is self.library_client:
+            logger.info("Library search cache hit")
+            return copy.deepcopy(cached[1])
+        
         try:
-            logger.info(f"Performing library search - query: {query}, limit: {limit}, type: {resource_type}")
+            logger.info("Performing library search - query: %s, limit: %s, type: %s", query, limit, resource_type)
             
             # Pass through optional date filters if supported by the client
             # Accept date_from/date_to as attributes on the SearchService call via kwargs
@@ -47,19 +76,53 @@ class SearchService:
             if results:
                 doc_count = len(results.get("docs", []))
                 total_results = results.get("info", {}).get("total", 0)
-                logger.info(f"Search returned {doc_count} docs, total available: {total_results}")
+                logger.info("Search returned %d docs, total available: %s", doc_count, total_results)
             else:
                 logger.warning("Search returned None or empty results")
-                
-            return results
         except Exception as e:
-            logger.error(f"Library search error: {e}")
+            logger.error("Library search error: %s", e)
             return None
+        
+        if results:
+            try:
+                client_ref = weakref.ref(self.library_client)
+            except TypeError:
+                # Clients without weakref support (e.g. __slots__) are just not cached
+                logger.debug("Library client %s cannot be weakly referenced; not caching", type(self.library_client))
+            else:
+                self._results_cache.set(cache_key, (client_ref, copy.deepcopy(results)))
+        return results
     
     def parse_results(self, results: Dict[str, Any]) -> List[Dict[str, str]]:
         """Parse search results using the formatter."""
-        docs = results.get("docs", [])
-        return [self.formatter.parse_document(doc) for doc in docs]
+        parse = self.formatter.parse_document
+        return [parse(doc) for doc in results.get("docs", ())]
+
+
+# Library client shared by the legacy helpers, created on first use
+_client: Optional[CSUSBLibraryClient] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> CSUSBLibraryClient:
+    """Return the shared CSUSBLibraryClient, creating it on first use.
+    
+    Double-checked locking keeps concurrent Streamlit sessions from each
+    building their own client while leaving the common path lock-free.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CSUSBLibraryClient()
+    return _client
+
+
+def reset_client() -> None:
+    """Drop the shared client so the next search builds a fresh one (for tests)."""
+    global _client
+    with _client_lock:
+        _client = None
 
 
 # Legacy function for backward compatibility - delegates to new service
@@ -71,9 +134,7 @@ def perform_library_search(
     date_to: Optional[int] = None,
 ) -> Optional[Dict[str, Any]]:
     """Legacy function - delegates to SearchService for backward compatibility."""
-    from core.clients.csusb_library_client import CSUSBLibraryClient
-    client = CSUSBLibraryClient()
-    service = SearchService(client)
+    service = SearchService(_get_client())
     return service.search(query, limit, resource_type, date_from=date_from, date_to=date_to)
 
 
@@ -3,6 +3,7 @@ Search suggestion service for generating alternative search terms.
 Follows SRP - Single Responsibility: Generate search suggestions.
 """
 from core.interfaces import ILLMClient, IPromptProvider
+from core.utils.cache import LRUCache
 from core.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -18,6 +19,10 @@ class SuggestionService:
         "Remove specific filters and search again"
     ]
     
+    # Suggestions keyed by case- and whitespace-normalized query. Shared across
+    # instances because the UI builds a fresh service for every session.
+    _suggestion_cache = LRUCache(maxsize=512)
+    
     def __init__(self, llm_client: ILLMClient, prompt_provider: IPromptProvider):
         """Initialize with dependencies (Dependency Injection)."""
         self.llm_client = llm_client
@@ -26,9 +31,15 @@ class SuggestionService:
     def generate_suggestions(self, original_query: str) -> str:
         """Generate alternative search suggestions using AI."""
         try:
+            cache_key = " ".join(original_query.lower().split())
+            cached = self._suggestion_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Suggestion cache hit")
+                return cached
             prompt = self.prompt_provider.get_suggestion_prompt(original_query)
-            suggestions = self.llm_client.chat(prompt)
-            return suggestions.strip()
+            suggestions = self.llm_client.chat(prompt).strip()
+            self._suggestion_cache.set(cache_key, suggestions)
+            return suggestions
         except Exception as e:
             logger.error(f"Error generating suggestions: {e}")
             return self._format_fallback_suggestions()
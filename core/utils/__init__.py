@@ -4,5 +4,6 @@ Utility modules for logging, error handling, and prompts.
 from .logging_utils import get_logger
 from .error_handler import ErrorHandler, SearchErrorHandler
 from .prompts import PromptManager
+from .cache import LRUCache
 
-__all__ = ['get_logger', 'ErrorHandler', 'SearchErrorHandler', 'PromptManager']
+__all__ = ['get_logger', 'ErrorHandler', 'SearchErrorHandler', 'PromptManager', 'LRUCache']
@@ -5,15 +5,54 @@ library client and conversation analyzer.
 """
 from __future__ import annotations
 # Date utilities for library search and conversation analysis
-from datetime import datetime
+from datetime import datetime, timezone
 import calendar
 import logging
 import re
+import time
 from typing import Optional, Tuple
+from core.utils.patterns import PriorityPatterns
 # Type alias for clarity
 MIN_YEAR = 1900
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import; helpers receive lowercased text
+_MONTH_NAMES = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_MONTH_TO_INT = {
+    name: idx
+    for idx, names in enumerate(
+        (("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+         ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+         ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+         ("dec", "december")),
+        start=1,
+    )
+    for name in names
+}
+_YEAR_RANGE_PATTERNS = (
+    re.compile(r"from\s+(\d{4})\s+(?:to|-)\s+(\d{4})"),
+    re.compile(r"between\s+(\d{4})\s+and\s+(\d{4})"),
+    re.compile(r"(\d{4})\s*[-–]\s*(\d{4})"),
+)
+_FULL_DATE_RE = re.compile(r"(\d{4})[\-/]?(\d{1,2})[\-/]?(\d{1,2})")
+_MONTH_DAY_YEAR_RE = re.compile(rf"{_MONTH_NAMES}\s+(\d{{1,2}}),?\s+(\d{{4}})")
+_MONTH_YEAR_RE = re.compile(rf"{_MONTH_NAMES}\s+(\d{{4}})")
+_SINCE_YEAR_RE = re.compile(r"since\s+(\d{4})")
+_LAST_N_YEARS_RE = re.compile(r"last\s+(\d{1,2})\s+years")
+_LAST_N_MONTHS_RE = re.compile(r"last\s+(\d{1,2})\s+months")
+_LAST_MONTH_RE = re.compile(r"last\s+month")
+_QUARTER_RE = re.compile(r"q([1-4])\s*(\d{4})")
+_CLOSED_YEAR_RE = re.compile(r"\b(?:in|for|during|on|only|just)\s+(19|20)\d{2}\b")
+_YEAR_RE = re.compile(r"\b(19|20)\d{2}\b")
+# Deletes every ASCII character except 0-9 (str.isdigit agrees on ASCII)
+_ASCII_NON_DIGITS = str.maketrans("", "", "".join(chr(i) for i in range(128) if not chr(i).isdigit()))
+# Every date pattern except "last month" needs a digit
+_ANY_DIGIT_RE = re.compile(r"\d")
+
+def _utcnow() -> datetime:
+    """Current UTC time as an aware datetime (datetime.utcnow() is deprecated)."""
+    return datetime.now(timezone.utc)
+
 # Helper functions for various date pattern extractions
 def _extract_year_range(text: str) -> Tuple[Optional[int], Optional[int]]:
     """Extract year range patterns like '2015-2020', 'from 2015 to 2020', etc.
@@ -21,13 +60,8 @@ def _extract_year_range(text: str) -> Tuple[Optional[int], Optional[int]]:
     Returns:
         Tuple[Optional[int], Optional[int]]: (year_from, year_to) or (None, None).
     """
-    patterns = [
-        r"from\s+(\d{4})\s+(?:to|-)\s+(\d{4})",
-        r"between\s+(\d{4})\s+and\s+(\d{4})",
-        r"(\d{4})\s*[-–]\s*(\d{4})",
-    ]
-    for pattern in patterns:
-        m = re.search(pattern, text)
+    for pattern in _YEAR_RANGE_PATTERNS:
+        m = pattern.search(text)
         if m:
             y1, y2 = m.groups()
             return int(y1), int(y2)
@@ -40,13 +74,10 @@ def _extract_full_date(text: str) -> Tuple[Optional[int], None]:
     Returns:
         Tuple[Optional[int], None]: (YYYYMMDD, None) or (None, None).
     """
-    m = re.search(r"(\d{4})[\-/]?(\d{1,2})[\-/]?(\d{1,2})", text)
+    m = _FULL_DATE_RE.search(text)
     if m:
         y, mm, dd = m.groups()
-        try:
-            return int(f"{int(y):04d}{int(mm):02d}{int(dd):02d}"), None
-        except ValueError as e:
-            logger.error(f"Error parsing date: {e}")
+        return int(y) * 10000 + int(mm) * 100 + int(dd), None
     return None, None
 
 # Month with day and year extraction helper
@@ -56,19 +87,12 @@ def _extract_month_name_with_day_and_year(text: str) -> Tuple[Optional[int], Non
     Returns:
         Tuple[Optional[int], None]: (YYYYMMDD, None) or (None, None).
     """
-    month_names = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
-    m = re.search(rf"{month_names}\s+(\d{{1,2}}),?\s+(\d{{4}})", text)
+    m = _MONTH_DAY_YEAR_RE.search(text)
     if m:
         mon, day, yr = m.groups()
-        try:
-            try:
-                month_idx = datetime.strptime(mon, "%b").month if len(mon) == 3 else datetime.strptime(mon, "%B").month
-            except Exception as e:
-                logger.error(f"Error parsing month name: {e}")
-                month_idx = datetime.strptime(mon[:3], "%b").month
-            return int(f"{int(yr):04d}{int(month_idx):02d}{int(day):02d}"), None
-        except Exception as e:
-            logger.error(f"Error extracting month/day/year: {e}")
+        # The regex only captures known month spellings, so the lookup cannot miss
+        month_idx = _MONTH_TO_INT[mon]
+        return int(yr) * 10000 + month_idx * 100 + int(day), None
     return None, None
 
 # Month and year extraction helper 
@@ -78,15 +102,11 @@ def _extract_month_year(text: str) -> Tuple[Optional[int], None]:
     Returns:
         Tuple[Optional[int], None]: (YYYYMM01, None) or (None, None).
     """
-    month_names = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
-    m = re.search(rf"{month_names}\s+(\d{{4}})", text)
+    m = _MONTH_YEAR_RE.search(text)
     if m:
         mon, yr = m.groups()
-        try:
-            month_idx = datetime.strptime(mon[:3], "%b").month
-            return int(f"{int(yr):04d}{int(month_idx):02d}01"), None
-        except Exception as e:
-            logger.error(f"Error extracting month/year: {e}")
+        month_idx = _MONTH_TO_INT[mon]
+        return int(yr) * 10000 + month_idx * 100 + 1, None
     return None, None
 
 # Since YYYY extraction helper
@@ -96,63 +116,72 @@ def _extract_since_year(text: str) -> Tuple[Optional[int], None]:
     Returns:
         Tuple[Optional[int], None]: (YYYY, None) or (None, None).
     """
-    m = re.search(r"since\s+(\d{4})", text)
+    m = _SINCE_YEAR_RE.search(text)
     if m:
         y = int(m.group(1))
         return y, None
     return None, None
 # Last N years extraction helper
 
-def _extract_last_n_years(text: str) -> Tuple[Optional[int], Optional[int]]:
+def _extract_last_n_years(text: str, now: Optional[datetime] = None) -> Tuple[Optional[int], Optional[int]]:
     """Extract 'last N years' patterns.
     
+    Args:
+        text: Lowercased input text.
+        now: Current UTC time; looked up only when the pattern matches.
+    
     Returns:
         Tuple[Optional[int], Optional[int]]: (year_from, year_to) or (None, None).
     """
-    m = re.search(r"last\s+(\d{1,2})\s+years", text)
+    m = _LAST_N_YEARS_RE.search(text)
     if m:
         n = int(m.group(1))
-        now = datetime.utcnow().year
-        return now - n + 1, now
+        year = (now or _utcnow()).year
+        return year - n + 1, year
     return None, None
 
 # Last N months extraction helper
-def _extract_last_n_months(text: str) -> Tuple[Optional[int], Optional[int]]:
+def _extract_last_n_months(text: str, now: Optional[datetime] = None) -> Tuple[Optional[int], Optional[int]]:
     """Extract 'last N months' patterns.
     
+    Args:
+        text: Lowercased input text.
+        now: Current UTC time; looked up only when the pattern matches.
+    
     Returns:
         Tuple[Optional[int], Optional[int]]: (YYYYMM01, YYYYMMDD) or (None, None).
     """
-    m = re.search(r"last\s+(\d{1,2})\s+months", text)
+    m = _LAST_N_MONTHS_RE.search(text)
     if m:
         n = int(m.group(1))
-        now_dt = datetime.utcnow()
-        start_month = (now_dt.month - n + 1)
-        start_year = now_dt.year
-        while start_month <= 0:
-            start_month += 12
-            start_year -= 1
-        start = int(f"{start_year:04d}{start_month:02d}01")
-        end = int(now_dt.strftime("%Y%m%d"))
+        now_dt = now or _utcnow()
+        # Count months from year 0 so one divmod handles any year rollover
+        start_year, start_month0 = divmod(now_dt.year * 12 + now_dt.month - n, 12)
+        start = start_year * 10000 + (start_month0 + 1) * 100 + 1
+        end = now_dt.year * 10000 + now_dt.month * 100 + now_dt.day
         return start, end
     return None, None
 
 # Last month extraction helper
-def _extract_last_month(text: str) -> Tuple[Optional[int], Optional[int]]:
+def _extract_last_month(text: str, now: Optional[datetime] = None) -> Tuple[Optional[int], Optional[int]]:
     """Extract 'last month' pattern.
     
+    Args:
+        text: Lowercased input text.
+        now: Current UTC time; looked up only when the pattern matches.
+    
     Returns:
         Tuple[Optional[int], Optional[int]]: (YYYYMM01, YYYYMMDD) or (None, None).
     """
-    if re.search(r"last\s+month", text):
-        now_dt = datetime.utcnow()
+    if _LAST_MONTH_RE.search(text):
+        now_dt = now or _utcnow()
         mth = now_dt.month - 1
         yr = now_dt.year
         if mth == 0:
             mth = 12
             yr -= 1
-        start = int(f"{yr:04d}{mth:02d}01")
-        end = int(now_dt.strftime("%Y%m%d"))
+        start = yr * 10000 + mth * 100 + 1
+        end = now_dt.year * 10000 + now_dt.month * 100 + now_dt.day
         return start, end
     return None, None
 
@@ -163,15 +192,15 @@ def _extract_quarter(text: str) -> Tuple[Optional[int], Optional[int]]:
     Returns:
         Tuple[Optional[int], Optional[int]]: (YYYYMM01, YYYYMM31) or (None, None).
     """
-    m = re.search(r"q([1-4])\s*(\d{4})", text)
+    m = _QUARTER_RE.search(text)
     if m:
         q, yr = m.groups()
         q = int(q)
         yr = int(yr)
         quarter_map = {1: (1, 3), 2: (4, 6), 3: (7, 9), 4: (10, 12)}
         start_m, end_m = quarter_map[q]
-        start = int(f"{yr:04d}{start_m:02d}01")
-        end = int(f"{yr:04d}{end_m:02d}31")
+        start = yr * 10000 + start_m * 100 + 1
+        end = yr * 10000 + end_m * 100 + 31
         return start, end
     return None, None
 
@@ -184,7 +213,7 @@ def _extract_single_year(text: str) -> Tuple[Optional[int], None]:
     """
     # Look for explicit phrasing that indicates a closed single-year range
     # e.g., 'in 2018', 'for 2018', 'during 2018', 'only 2022', 'just 2020' -> interpret as that full year
-    m_closed = re.search(r"\b(?:in|for|during|on|only|just)\s+(19|20)\d{2}\b", text)
+    m_closed = _CLOSED_YEAR_RE.search(text)
     if m_closed:
         year = int(m_closed.group(0).split()[-1])
         return year, year
@@ -192,10 +221,18 @@ def _extract_single_year(text: str) -> Tuple[Optional[int], None]:
     # Default: bare year mention without explicit preposition -> treat as
     # a year-bound lower bound (open-ended) so callers can decide how to
     # expand or clamp (e.g., 'since 2018' or '1999').
-    m = re.search(r"\b(19|20)\d{2}\b", text)
+    return _extract_bare_year(text)
+
+# Bare year extraction helper
+def _extract_bare_year(text: str) -> Tuple[Optional[int], None]:
+    """Extract a bare year mention like '1999' as an open-ended lower bound.
+    
+    Returns:
+        Tuple[Optional[int], None]: (YYYY, None) or (None, None).
+    """
+    m = _YEAR_RE.search(text)
     if m:
-        year = int(m.group(0))
-        return year, None
+        return int(m.group(0)), None
     return None, None
 
 # Date normalization function
@@ -219,92 +256,97 @@ def normalize_date_bound(value: Optional[int | str], is_start: bool) -> Optional
     - enforces MIN_YEAR
     """
     if value is None:
-        return "19000101" if is_start else datetime.utcnow().strftime("%Y%m%d")
+        return "19000101" if is_start else _get_today_yyyymmdd()
 
     s = str(value)
-    digits = "".join(ch for ch in s if ch.isdigit())
+    if s.isdigit():
+        # Ints and plain digit strings, by far the common case
+        digits = s
+    elif s.isascii():
+        digits = s.translate(_ASCII_NON_DIGITS)
+    else:
+        digits = "".join(ch for ch in s if ch.isdigit())
 
     if not digits:
         return None
 
-    # If we have at least 8 digits, use first 8
-    if len(digits) >= 8:
-        ymd = digits[:8]
-        year = int(ymd[:4])
-        if year < MIN_YEAR:
-            raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-        return ymd
-
-    # 4-digit year
-    if len(digits) == 4:
-        year = int(digits)
-        if year < MIN_YEAR:
-            raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-        return f"{digits}0101" if is_start else f"{digits}1231"
-
-    # 6-digit YYYYMM
-    if len(digits) == 6:
-        year = int(digits[:4])
-        month = int(digits[4:6])
-        if year < MIN_YEAR:
-            raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-        month = max(1, min(month, 12))
-        if is_start:
-            return f"{year:04d}{month:02d}01"
-        last = calendar.monthrange(year, month)[1]
-        return f"{year:04d}{month:02d}{last:02d}"
-
-    # 5,7 or other >4 digits: first 4 are year, rest month/day where possible
-    if len(digits) > 4:
-        year = int(digits[:4])
-        if year < MIN_YEAR:
-            raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-        rest = digits[4:]
-        if len(rest) == 1:
-            month = int(rest)
-            month = max(1, min(month, 12))
-            if is_start:
-                return f"{year:04d}{month:02d}01"
-            last = calendar.monthrange(year, month)[1]
-            return f"{year:04d}{month:02d}{last:02d}"
-        if len(rest) >= 2:
-            month = int(rest[:2])
-            month = max(1, min(month, 12))
-            if is_start:
-                return f"{year:04d}{month:02d}01"
-            last = calendar.monthrange(year, month)[1]
-            return f"{year:04d}{month:02d}{last:02d}"
-
-    # short year-like (<=4 digits but not caught above)
-    if len(digits) <= 4 and digits.isdigit():
-        year = int(digits)
-        if year < MIN_YEAR:
-            raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-        return f"{year:04d}0101" if is_start else f"{year:04d}1231"
-
-    # fallback: pad/truncate to 8
-    if len(digits) < 8:
-        padded = digits.ljust(8, "0")
-    else:
-        padded = digits[:8]
-    year = int(padded[:4])
+    year = int(digits[:4])
     if year < MIN_YEAR:
         raise ValueError(f"Year {year} is before minimum allowed {MIN_YEAR}")
-    return padded
+    return _BOUND_BY_LENGTH[min(len(digits), 8)](digits, year, is_start)
+
+# Bound builders for normalize_date_bound, by digit count (year already validated)
+def _year_bound(digits: str, year: int, is_start: bool) -> str:
+    """Up to 4 digits: the whole year."""
+    return f"{year:04d}0101" if is_start else f"{year:04d}1231"
+
+def _month_bound(digits: str, year: int, is_start: bool) -> str:
+    """5-7 digits: year plus a one- or two-digit month, clamped to 1-12."""
+    month = max(1, min(int(digits[4:6]), 12))
+    if is_start:
+        return f"{year:04d}{month:02d}01"
+    last = calendar.monthrange(year, month)[1]
+    return f"{year:04d}{month:02d}{last:02d}"
+
+def _day_bound(digits: str, year: int, is_start: bool) -> str:
+    """8 or more digits: the first 8 are a full YYYYMMDD."""
+    return digits[:8]
+
+_BOUND_BY_LENGTH = (
+    None,
+    _year_bound, _year_bound, _year_bound, _year_bound,
+    _month_bound, _month_bound, _month_bound,
+    _day_bound,
+)
+
+# Today's UTC YYYYMMDD and the monotonic time it was computed at
+_TODAY_CACHE = {"ts": float("-inf"), "value": ""}
+_TODAY_TTL_SECONDS = 60
 
 # Today YYYYMMDD helper
 def _get_today_yyyymmdd() -> str:
     """Get today's date in YYYYMMDD format.
     
-    Centralized helper to avoid duplication across modules.
+    Centralized helper to avoid duplication across modules. The clock is
+    read and formatted at most once a minute, so the value can lag UTC
+    midnight by up to that long.
     
     Returns:
         str: Today's date as YYYYMMDD (e.g., "20251027").
     """
-    return datetime.utcnow().strftime("%Y%m%d")
+    now_ts = time.monotonic()
+    if now_ts - _TODAY_CACHE["ts"] >= _TODAY_TTL_SECONDS:
+        _TODAY_CACHE["value"] = _utcnow().strftime("%Y%m%d")
+        _TODAY_CACHE["ts"] = now_ts
+    return _TODAY_CACHE["value"]
+
+# Every helper pattern in the order extract_dates_from_text tries them:
+# (pattern, helper, helper takes `now`)
+_DATE_PATTERN_HELPERS = (
+    # Range patterns first (highest priority to avoid mismatches)
+    *((pattern, _extract_year_range, False) for pattern in _YEAR_RANGE_PATTERNS),
+    # Full date patterns (before month names to avoid partial matches)
+    (_FULL_DATE_RE, _extract_full_date, False),
+    # Month with day and year (before month-only to avoid partial matches)
+    (_MONTH_DAY_YEAR_RE, _extract_month_name_with_day_and_year, False),
+    (_MONTH_YEAR_RE, _extract_month_year, False),
+    (_SINCE_YEAR_RE, _extract_since_year, False),
+    (_LAST_N_YEARS_RE, _extract_last_n_years, True),
+    (_LAST_N_MONTHS_RE, _extract_last_n_months, True),
+    (_LAST_MONTH_RE, _extract_last_month, True),
+    (_QUARTER_RE, _extract_quarter, False),
+    # Single year mention: closed ('in 2018') before bare ('2018')
+    (_CLOSED_YEAR_RE, _extract_single_year, False),
+    # The fused sweep only lands here when no closed phrasing matched,
+    # so skip re-probing for it
+    (_YEAR_RE, _extract_bare_year, False),
+)
+_ALL_DATES = PriorityPatterns(entry[0] for entry in _DATE_PATTERN_HELPERS)
 
 # Main date extraction function
-def extract_dates_from_text(text: str) -> Tuple[Optional[int], Optional[int]]:
+def extract_dates_from_text(
+    text: str, now: Optional[datetime] = None, *, lowered: bool = False
+) -> Tuple[Optional[int], Optional[int]]:
     """Heuristic extraction of date_from and date_to from natural text.
 
     Supports multiple date format patterns:
@@ -322,6 +364,11 @@ def extract_dates_from_text(text: str) -> Tuple[Optional[int], Optional[int]]:
         >>> extract_dates_from_text("last 3 years")
         (2023, 2025)  # varies by current year
 
+    Args:
+        text: Free text that may mention dates.
+        now: Current UTC time for relative phrases; defaults to the real clock.
+        lowered: Set when the caller already lowercased text, to skip doing it again.
+
     Returns:
         Tuple[Optional[int], Optional[int]]: (date_from, date_to) where values are
         integers either YYYY or YYYYMMDD (or full YYYYMMDD) depending on what was found,
@@ -330,60 +377,21 @@ def extract_dates_from_text(text: str) -> Tuple[Optional[int], Optional[int]]:
     if not text:
         return None, None
 
-    text_low = text.lower()
+    text_low = text if lowered else text.lower()
 
-    # Try each pattern helper in priority order
-    # Range patterns first (highest priority to avoid mismatches)
-    result = _extract_year_range(text_low)
-    if result != (None, None):
-        return result
-
-    # Full date patterns (before month names to avoid partial matches)
-    result = _extract_full_date(text_low)
-    if result != (None, None):
-        return result
+    # Most messages carry no digits at all; only "last month" can match then
+    if not _ANY_DIGIT_RE.search(text_low):
+        return _extract_last_month(text_low, now)
 
-    # Month with day and year (before month-only to avoid partial matches)
-    result = _extract_month_name_with_day_and_year(text_low)
-    if result != (None, None):
-        return result
-
-    # Month + year (no day)
-    result = _extract_month_year(text_low)
-    if result != (None, None):
-        return result
-
-    # Since YYYY
-    result = _extract_since_year(text_low)
-    if result != (None, None):
-        return result
-
-    # Last N years
-    result = _extract_last_n_years(text_low)
-    if result != (None, None):
-        return result
-
-    # Last N months or 'last month'
-    result = _extract_last_n_months(text_low)
-    if result != (None, None):
-        return result
-
-    # Last month (specific pattern)
-    result = _extract_last_month(text_low)
-    if result != (None, None):
-        return result
-
-    # Quarter like Q1 2018
-    result = _extract_quarter(text_low)
-    if result != (None, None):
-        return result
-
-    # Single year mention
-    result = _extract_single_year(text_low)
-    if result != (None, None):
-        return result
+    # One fused sweep finds the first helper, in priority order, whose
+    # pattern matches anywhere; the sequential chain would have accepted it
+    found = _ALL_DATES.search(text_low)
+    if found is None:
+        return None, None
 
-    return None, None
+    # Run only the winning helper to compute its values
+    helper, uses_now = _DATE_PATTERN_HELPERS[found[0]][1:]
+    return helper(text_low, now) if uses_now else helper(text_low)
 
 
 
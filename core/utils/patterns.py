@@ -0,0 +1,79 @@
+"""
+Regex builders for keyword and multi-pattern matching.
+Used to scan text for many keywords or patterns in a single compiled regex.
+"""
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def keyword_alternation(keywords: Iterable[str]) -> str:
+    """Build a regex alternation for keywords with shared prefixes factored out.
+
+    The keywords are arranged in a trie, so ("find articles", "find me")
+    becomes "find\\ (?:articles|me)" and the regex engine tests each shared
+    prefix once instead of once per keyword. The pattern matches exactly
+    the same strings as a plain "|".join of the escaped keywords.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End-of-keyword marker
+    return _trie_to_pattern(trie)
+
+
+def _trie_to_pattern(node: Dict[str, dict]) -> str:
+    """Render one trie node (and everything below it) as a regex fragment."""
+    branches = []
+    for ch in sorted(key for key in node if key):
+        # Collapse single-child chains into one literal run
+        literal = ch
+        child = node[ch]
+        while len(child) == 1 and "" not in child:
+            (next_ch, child), = child.items()
+            literal += next_ch
+        branches.append(re.escape(literal) + _trie_to_pattern(child))
+
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # A keyword ends here, so everything below is optional
+    return f"(?:{body})?" if "" in node else body
+
+
+class PriorityPatterns:
+    """Find which of several regexes, tried in priority order, matches first.
+
+    Equivalent to calling ``pattern.search(text)`` for each pattern in order
+    and stopping at the first hit, but scans the text once: the patterns are
+    fused into one zero-width lookahead alternation, so ``finditer`` reports
+    the highest-priority pattern starting at every position. Patterns must
+    not define named groups of their own.
+    """
+
+    def __init__(self, patterns: Iterable[re.Pattern]):
+        """Fuse ``patterns`` (highest priority first) into one compiled regex."""
+        self.patterns = tuple(patterns)
+        self._fused = re.compile(
+            "(?=" + "|".join(f"(?P<p{i}>{p.pattern})" for i, p in enumerate(self.patterns)) + ")",
+            self.patterns[0].flags if self.patterns else 0,
+        )
+
+    def search(self, text: str) -> Optional[Tuple[int, re.Match]]:
+        """Return (index, match) for the highest-priority pattern found in text.
+
+        The match is that pattern's own leftmost match, as ``search`` would
+        return it, or None if no pattern matches anywhere.
+        """
+        best = None
+        start = 0
+        for m in self._fused.finditer(text):
+            index = int(m.lastgroup[1:])
+            if best is None or index < best:
+                best, start = index, m.start()
+                if index == 0:
+                    break
+        if best is None:
+            return None
+        return best, self.patterns[best].match(text, start)
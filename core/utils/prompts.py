@@ -89,10 +89,9 @@ Assistant: "I'm a scholarly research assistant designed to help you find academi
 
 IMPORTANT: Stay strictly within the scope of scholarly research assistance. Redirect any off-topic queries."""
 
-    PARAMETER_EXTRACTION_TEMPLATE = """Extract search parameters from this conversation as JSON.
-
-Conversation:
-{conversation_text}
+    # Static instructions come first and the conversation last, so providers
+    # with prompt caching can reuse the long unchanging prefix across turns
+    PARAMETER_EXTRACTION_TEMPLATE = """Extract search parameters from the conversation at the end of this message as JSON.
 
 IMPORTANT: This may be a NEW search OR a REFINEMENT of a previous search.
 
@@ -152,10 +151,13 @@ NEW SEARCH with dates:
 User: "Find peer reviewed journals on nursing education from last 3 years"
 {{"query": "nursing education", "limit": 10, "resource_type": "article", "date_from": "20230101", "date_to": "20251231"}}
 
-Respond with ONLY valid JSON, nothing else."""
+Respond with ONLY valid JSON, nothing else.
+
+Conversation:
+{conversation_text}"""
     
 
-    SUGGESTION_TEMPLATE = """The user searched for "{query}" in an academic library database but got 0 results.
+    SUGGESTION_TEMPLATE = """A user's search in an academic library database got 0 results. The search is given at the end of this message.
 
 Suggest 2-3 alternative, broader search terms that might work better. Keep suggestions short and relevant.
 
@@ -169,7 +171,9 @@ If user searched: "ott churn causes"
 Suggest:
 - customer churn
 - subscriber retention
-- streaming service analytics"""
+- streaming service analytics
+
+The user searched for: "{query}\""""
 
     def get_follow_up_prompt(self) -> str:
         """Get the system prompt for follow-up questions."""
@@ -0,0 +1,39 @@
+"""
+Unit tests for the in-process cache helpers.
+"""
+from core.utils import cache as cache_module
+from core.utils.cache import LRUCache, TTLCache, text_digest
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """The oldest untouched entry is dropped once the cache is full."""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """Entries are served until their TTL elapses, then dropped."""
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("q", {"docs": []})
+
+    now[0] = 159.0
+    assert cache.get("q") == {"docs": []}
+
+    now[0] = 160.0
+    assert cache.get("q", "miss") == "miss"
+    assert "q" not in cache
+
+
+def test_text_digest_is_stable():
+    """Equal texts share a digest, different texts do not."""
+    assert text_digest("climate") == text_digest("climate")
+    assert text_digest("climate") != text_digest("Climate")
@@ -3,8 +3,8 @@ Unit tests for ConversationAnalyzer service.
 Uses mocks to test without external LLM API calls.
 """
 import pytest
-from unittest.mock import Mock, MagicMock
-from core.services.conversation_analyzer import ConversationAnalyzer
+from unittest.mock import Mock, MagicMock, patch
+from core.services.conversation_analyzer import ConversationAnalyzer, ConversationView
 from core.interfaces import ILLMClient, IPromptProvider
 
 
@@ -23,6 +23,10 @@ class TestConversationAnalyzer:
         
         # Create analyzer with mocks
         self.analyzer = ConversationAnalyzer(self.mock_llm, self.mock_prompts)
+        
+        # Extraction results are cached across instances; start each test clean
+        ConversationAnalyzer._params_cache.clear()
+        ConversationAnalyzer._follow_up_cache.clear()
     
     def test_should_trigger_search_explicit_keywords(self):
         """Test explicit search trigger detection."""
@@ -36,6 +40,14 @@ class TestConversationAnalyzer:
         assert self.analyzer.should_trigger_search("I need help") == False
         assert self.analyzer.should_trigger_search("What is AI?") == False
     
+    def test_keyword_group_checks(self):
+        """Off-topic, metadata and refinement checks match keywords anywhere in the input."""
+        assert self.analyzer.is_off_topic_question("Are you a robot?")
+        assert not self.analyzer.is_off_topic_question("Any research on coral reefs?")
+        assert self.analyzer.is_metadata_question("How many results did you find?")
+        assert not self.analyzer.is_metadata_question("Climate change effects on coral reefs")
+        assert self.analyzer.is_refinement_query("Change to books")
+    
     def test_get_follow_up_response_success(self):
         """Test successful follow-up response generation."""
         self.mock_llm.chat.return_value = "What topic are you interested in?"
@@ -54,7 +66,38 @@ class TestConversationAnalyzer:
         response = self.analyzer.get_follow_up_response(conversation)
         
         assert "research topic" in response.lower()
-    
+
+    def test_stream_follow_up_response_yields_chunks(self):
+        """Test streamed follow-up response passes chunks through."""
+        self.mock_llm.chat_stream.return_value = iter(["What ", "topic?"])
+
+        conversation = [{"role": "user", "content": "I need help"}]
+        chunks = list(self.analyzer.stream_follow_up_response(conversation))
+
+        assert chunks == ["What ", "topic?"]
+        self.mock_llm.chat_stream.assert_called_once()
+
+    def test_follow_up_response_cached_for_same_conversation(self):
+        """A repeated conversation reuses the earlier reply, streamed or not, stripped like chat()."""
+        self.mock_llm.chat_stream.return_value = iter(["\nWhat ", "topic?\n"])
+        conversation = [{"role": "user", "content": "I need help"}]
+
+        list(self.analyzer.stream_follow_up_response(conversation))
+        assert self.analyzer.get_follow_up_response(conversation) == "What topic?"
+        assert list(self.analyzer.stream_follow_up_response(conversation)) == ["What topic?"]
+
+        self.mock_llm.chat.assert_not_called()
+        self.mock_llm.chat_stream.assert_called_once()
+
+    def test_stream_follow_up_response_error_handling(self):
+        """Test streamed follow-up response falls back when the stream fails."""
+        self.mock_llm.chat_stream.side_effect = Exception("API Error")
+
+        conversation = [{"role": "user", "content": "test"}]
+        response = "".join(self.analyzer.stream_follow_up_response(conversation))
+
+        assert "research topic" in response.lower()
+
     def test_extract_search_parameters_success(self):
         """Test successful parameter extraction."""
         mock_json = '{"query": "machine learning", "limit": 5, "resource_type": "article"}'
@@ -67,6 +110,80 @@ class TestConversationAnalyzer:
         assert params["limit"] == 5
         assert params["resource_type"] == "article"
     
+    def test_extract_search_parameters_cached_for_same_conversation(self):
+        """Repeated extraction for an identical conversation reuses the first LLM result."""
+        self.mock_llm.chat.return_value = '{"query": "machine learning", "limit": 5, "resource_type": "article"}'
+        
+        conversation = [{"role": "user", "content": "I need 5 articles on ML"}]
+        first = self.analyzer.extract_search_parameters(conversation)
+        first["query"] = "mutated by caller"
+        second = self.analyzer.extract_search_parameters(conversation)
+        
+        assert second["query"] == "machine learning"
+        self.mock_llm.chat.assert_called_once()
+
+    def test_extract_search_parameters_cache_keyed_by_day_and_prompt(self):
+        """Cached extractions expire with the UTC day and never cross prompt templates."""
+        self.mock_llm.chat.return_value = '{"query": "machine learning", "limit": 5, "resource_type": "article"}'
+        conversation = [{"role": "user", "content": "I need 5 articles on ML"}]
+        
+        with patch("time.time", return_value=86400 * 20000):
+            self.analyzer.extract_search_parameters(conversation)
+            self.mock_prompts.get_parameter_extraction_prompt.return_value = "Other template"
+            self.analyzer.extract_search_parameters(conversation)
+        with patch("time.time", return_value=86400 * 20001):
+            self.analyzer.extract_search_parameters(conversation)
+        
+        assert self.mock_llm.chat.call_count == 3
+
+    def test_extract_search_parameters_heuristic_skips_llm(self):
+        """A complete, explicit request is extracted without calling the LLM."""
+        conversation = [{"role": "user", "content": "I need 5 articles about machine learning from 2020 to 2022"}]
+        params = self.analyzer.extract_search_parameters(conversation)
+
+        assert params == {
+            "query": "machine learning",
+            "limit": 5,
+            "resource_type": "article",
+            "date_from": "20200101",
+            "date_to": "20221231",
+        }
+        self.mock_llm.chat.assert_not_called()
+
+    def test_heuristic_defers_when_message_is_not_fully_covered(self):
+        """Vague topics or words outside the topic and date phrases go to the LLM."""
+        for message in (
+            "Show me 5 articles on the last decade of AI research since 2015",
+            "I need 5 articles on covid vaccines from 2020 to 2022 in Canada",
+            "I need 5 articles about AI from 2020 to 2022",
+        ):
+            assert self.analyzer._try_heuristic_extraction([{"role": "user", "content": message}]) is None
+        
+        params = self.analyzer._try_heuristic_extraction(
+            [{"role": "user", "content": "I need 5 articles about nurse burnout in 2021"}]
+        )
+        assert params["query"] == "nurse burnout"
+        assert params["date_to"] == "20211231"
+
+    def test_heuristic_defers_on_exclusions_and_operators(self):
+        """Topics with exclusions or logical operators are left for the LLM to rewrite."""
+        for phrase in ("excluding policy", "without policy", "but not policy",
+                       "and not on policy", "except policy", "or energy"):
+            message = f"Give me 5 articles on climate change {phrase} from 2020 to 2022"
+            assert self.analyzer._try_heuristic_extraction([{"role": "user", "content": message}]) is None
+        
+        message = "Give me 5 articles on cats or dogs from 2020 to 2022"
+        assert self.analyzer._try_heuristic_extraction([{"role": "user", "content": message}]) is None
+
+    def test_extract_search_parameters_incomplete_request_uses_llm(self):
+        """Without an explicit date the heuristic defers to the LLM."""
+        self.mock_llm.chat.return_value = '{"query": "machine learning", "limit": 5, "resource_type": "article"}'
+
+        conversation = [{"role": "user", "content": "I need 5 articles about machine learning"}]
+        self.analyzer.extract_search_parameters(conversation)
+
+        self.mock_llm.chat.assert_called_once()
+
     def test_extract_search_parameters_fallback(self):
         """Test fallback when extraction fails."""
         self.mock_llm.chat.side_effect = Exception("Parse error")
@@ -78,6 +195,32 @@ class TestConversationAnalyzer:
         assert params["limit"] == 10
         assert params["resource_type"] is None
     
+    def test_extract_search_parameters_invalid_json_uses_fallback(self):
+        """Malformed or non-object JSON from the LLM falls back to heuristics."""
+        conversation = [{"role": "user", "content": "test query"}]
+        
+        self.mock_llm.chat.return_value = "not json at all"
+        assert self.analyzer.extract_search_parameters(conversation)["query"] == "test query"
+        
+        self.mock_llm.chat.return_value = '["machine learning"]'
+        assert self.analyzer.extract_search_parameters(conversation)["query"] == "test query"
+    
+    def test_extract_search_parameters_merges_refinement(self):
+        """A refinement keeps previous fields and overrides only the ones provided."""
+        self.mock_llm.chat.return_value = (
+            '{"query": "only 2022", "limit": null, "resource_type": null, '
+            '"date_from": "20220101", "date_to": "20221231"}'
+        )
+        previous = {"query": "nursing education", "limit": 5, "resource_type": "book",
+                    "date_from": None, "date_to": None}
+
+        conversation = [{"role": "user", "content": "only 2022"}]
+        params = self.analyzer.extract_search_parameters(conversation, previous)
+
+        assert params == {"query": "nursing education", "limit": 5, "resource_type": "book",
+                          "date_from": "20220101", "date_to": "20221231"}
+        assert previous["date_from"] is None
+
     def test_fallback_extraction(self):
         """Test private fallback extraction method."""
         conversation = [
@@ -92,6 +235,44 @@ class TestConversationAnalyzer:
         assert params["limit"] == 10
         assert params["resource_type"] is None
     
+    def test_fallback_extraction_looks_back_for_topic(self):
+        """Short answers and refinements reuse the last substantive topic."""
+        conversation = [
+            {"role": "user", "content": "climate change impacts on agriculture"},
+            {"role": "assistant", "content": "What type of resources?"},
+            {"role": "user", "content": "articles"}
+        ]
+        params = self.analyzer._fallback_extraction(conversation)
+        assert params["query"] == "climate change impacts on agriculture"
+        assert params["resource_type"] == "article"
+        
+        conversation[-1] = {"role": "user", "content": "only 2022"}
+        params = self.analyzer._fallback_extraction(conversation)
+        assert params["query"] == "climate change impacts on agriculture"
+        assert params["date_from"] == "20220101"
+    
+    def test_extract_limit_heuristic(self):
+        """Explicit counts are picked up; text without numbers uses the default."""
+        assert self.analyzer._extract_limit_heuristic("I need 5 articles on AI") == 5
+        assert self.analyzer._extract_limit_heuristic("Find 3 books") == 3
+        assert self.analyzer._extract_limit_heuristic("articles about nursing") == 10
+        assert self.analyzer._extract_limit_heuristic("I need 500 articles") == 10
+    
+    def test_extract_resource_type_heuristic(self):
+        """Whole-word resource nouns map to types, with articles taking priority."""
+        assert self.analyzer._extract_resource_type_heuristic("Peer reviewed Journals please") == "article"
+        assert self.analyzer._extract_resource_type_heuristic("ebooks or articles on AI") == "article"
+        assert self.analyzer._extract_resource_type_heuristic("theses and books") == "book"
+        assert self.analyzer._extract_resource_type_heuristic("a dissertation on AI") == "thesis"
+        assert self.analyzer._extract_resource_type_heuristic("notebook thesistitle") is None
+    
+    def test_extract_date_parameters(self):
+        """Short date replies normalize to YYYYMMDD bounds, including repeats."""
+        expected = {"date_from": "20150101", "date_to": "20181231"}
+        assert self.analyzer.extract_date_parameters("2015-2018") == expected
+        assert self.analyzer.extract_date_parameters("2015-2018") == expected
+        assert self.analyzer.extract_date_parameters("any time") == {"date_from": None, "date_to": None}
+    
     def test_search_trigger_keywords_constant(self):
         """Test that search trigger keywords are defined."""
         assert len(ConversationAnalyzer.SEARCH_TRIGGER_KEYWORDS) > 0
@@ -108,6 +289,15 @@ class TestConversationAnalyzer:
         assert params.get("date_from") == "20150101"  # Year expanded to YYYYMMDD
         assert params.get("date_to") == "20181231"  # Year expanded to YYYYMMDD
 
+    def test_llm_without_dates_falls_back_to_transcript_dates(self):
+        """When the LLM omits dates they are read from the conversation text."""
+        self.mock_llm.chat.return_value = '{"query": "nursing", "limit": 10, "resource_type": null}'
+
+        conversation = [{"role": "user", "content": "Papers on nursing SINCE 2019"}]
+        params = self.analyzer.extract_search_parameters(conversation)
+
+        assert params["date_from"] == "20190101"
+
     def test_heuristic_date_extraction_since_and_last(self):
         """Heuristic extraction should catch 'since' and 'last N years' patterns and return YYYYMMDD strings."""
         # Simulate LLM failure
@@ -165,3 +355,43 @@ class TestConversationAnalyzer:
         date_to2 = params2.get("date_to")
         assert date_to2 is not None
         assert isinstance(date_to2, str) and len(date_to2) == 8
+
+    def test_normalize_date_param_current_year_end_is_today(self):
+        """An end bound in the current year (or later) is capped at today (UTC)."""
+        from datetime import datetime, timezone
+        now = datetime.now(timezone.utc)
+
+        assert self.analyzer._normalize_date_param(now.year, is_start=False) == now.strftime("%Y%m%d")
+        assert self.analyzer._normalize_date_param(2001, is_start=False) == "20011231"
+        assert self.analyzer._normalize_date_param(2001, is_start=True) == "20010101"
+
+    def test_normalize_date_param_month_end(self):
+        """YYYYMM end bounds expand to the last day of that month."""
+        assert self.analyzer._normalize_date_param(202002, is_start=False) == "20200229"
+        assert self.analyzer._normalize_date_param(202102, is_start=False) == "20210228"
+        assert self.analyzer._normalize_date_param("202004", is_start=False) == "20200430"
+        assert self.analyzer._normalize_date_param(202013, is_start=False) is None
+
+    def test_normalize_date_param_rejects_invalid_month_for_both_bounds(self):
+        """Months outside 1-12 are rejected for start and end bounds alike."""
+        for value in (202013, "202000"):
+            assert self.analyzer._normalize_date_param(value, is_start=True) is None
+            assert self.analyzer._normalize_date_param(value, is_start=False) is None
+        assert self.analyzer._normalize_date_param(202012, is_start=True) == "20201201"
+
+
+def test_conversation_view_builds_texts_once():
+    """ConversationView exposes joined texts and reuses them on repeat access."""
+    view = ConversationView([
+        {"role": "user", "content": "climate change"},
+        {"role": "assistant", "content": "What type?"},
+        {"role": "user", "content": "articles"},
+    ])
+
+    assert view.full_text == "user: climate change\nassistant: What type?\nuser: articles"
+    assert view.user_messages == ["climate change", "articles"]
+    assert view.user_text == "climate change\narticles"
+    assert view.last_user_message == "articles"
+    assert view.user_text is view.user_text
+    assert view.full_text_lower == view.full_text.lower()
+    assert ConversationView([]).last_user_message is None
@@ -1,5 +1,5 @@
 import calendar
-from datetime import datetime
+from datetime import datetime, timezone
 
 import pytest
 
@@ -16,6 +16,7 @@ from core.utils.dates import (
     _extract_last_month,
     _extract_quarter,
     _extract_single_year,
+    _extract_bare_year,
 )
 
 
@@ -101,6 +102,14 @@ def test_extract_last_n_years_and_months_and_last_month():
     assert d1 == expected_start and d2 == expected_end
 
 
+def test_extract_relative_phrases_with_fixed_now():
+    """Relative phrases are computed from the supplied UTC time."""
+    now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+    assert extract_dates_from_text("last month", now=now) == (20231201, 20240115)
+    assert extract_dates_from_text("last 3 months", now=now) == (20231101, 20240115)
+    assert extract_dates_from_text("last 5 years", now=now) == (2020, 2024)
+
+
 def test_normalize_non_leap_year_february():
     """Non-leap year February has 28 days."""
     res = normalize_date_bound(202102, False)
@@ -201,6 +210,7 @@ def test_extract_month_name_with_day_and_year_helper(text, expected):
         ("mar 2020", (20200301, None)),
         ("march 2020", (20200301, None)),
         ("december 2020", (20201201, None)),
+        ("sept 2020", (20200901, None)),
         ("no date here", (None, None)),
     ],
 )
@@ -277,3 +287,43 @@ def test_extract_single_year_helper(text, expected):
     """Test _extract_single_year helper function."""
     assert _extract_single_year(text) == expected
 
+
+def test_extract_bare_year_ignores_closed_phrasing():
+    """The bare-year helper always yields an open-ended bound."""
+    assert _extract_bare_year("papers in 2018") == (2018, None)
+    assert _extract_bare_year("no year") == (None, None)
+    assert extract_dates_from_text("papers in 2018") == (2018, 2018)
+    assert extract_dates_from_text("papers 2018") == (2018, None)
+
+
+def test_extract_dates_without_digits_only_matches_last_month():
+    """Digit-free text skips the pattern scan but still understands 'last month'."""
+    now = datetime(2025, 1, 15, tzinfo=timezone.utc)
+    assert extract_dates_from_text("Books about cats", now) == (None, None)
+    assert extract_dates_from_text("Articles from LAST month", now) == (20241201, 20250115)
+
+
+def test_today_yyyymmdd_cached_for_a_minute(monkeypatch):
+    """Today's date is formatted once and reused until the TTL runs out."""
+    from core.utils import dates
+
+    clock = [1000.0]
+    calls = []
+
+    def fake_utcnow():
+        calls.append(1)
+        return datetime(2024, 2, 29, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(dates.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(dates, "_utcnow", fake_utcnow)
+    monkeypatch.setitem(dates._TODAY_CACHE, "ts", float("-inf"))
+    monkeypatch.setitem(dates._TODAY_CACHE, "value", "")
+
+    assert normalize_date_bound(None, False) == "20240229"
+    clock[0] += 59
+    assert dates._get_today_yyyymmdd() == "20240229"
+    assert len(calls) == 1
+
+    clock[0] += 1
+    dates._get_today_yyyymmdd()
+    assert len(calls) == 2
@@ -0,0 +1,44 @@
+"""
+Unit tests for regex keyword builders.
+"""
+import re
+
+import pytest
+
+from core.utils.patterns import PriorityPatterns, keyword_alternation
+
+
+def test_keyword_alternation_factors_shared_prefixes():
+    """Keywords sharing a prefix are grouped under it."""
+    assert keyword_alternation(["find articles", "find me"]) == r"find\ (?:articles|me)"
+
+
+@pytest.mark.parametrize(
+    "keywords",
+    [
+        ["search now", "search for", "show me", "fetch", "find me", "find articles"],
+        ["a", "ab", "abc", "b"],
+        ["c++", "c#", "c"],
+    ],
+)
+def test_keyword_alternation_matches_exactly_the_keywords(keywords):
+    """The trie pattern accepts every keyword and nothing else."""
+    pattern = re.compile(keyword_alternation(keywords))
+    for keyword in keywords:
+        assert pattern.fullmatch(keyword)
+    for other in ["", "search", "find", "ac", "c+", "fetc"]:
+        if other not in keywords:
+            assert not pattern.fullmatch(other)
+
+
+def test_priority_patterns_prefers_order_over_position():
+    """A higher-priority pattern wins even when a lower one matches earlier."""
+    patterns = PriorityPatterns([re.compile(r"since (\d{4})"), re.compile(r"(\d{4})")])
+
+    index, match = patterns.search("1999 papers since 2018")
+    assert index == 0 and match.group(1) == "2018"
+
+    index, match = patterns.search("papers from 1999 and 2005")
+    assert index == 1 and match.group(1) == "1999"
+
+    assert patterns.search("no years here") is None
@@ -33,6 +33,16 @@ class TestPromptManager:
         assert "limit" in prompt.lower()
         assert "resource_type" in prompt.lower()
     
+    def test_parameter_extraction_prompt_ends_with_conversation(self):
+        """Dynamic conversation text comes last so the static prefix is cacheable."""
+        conversation_text = "user: I need articles"
+        first = self.manager.get_parameter_extraction_prompt(conversation_text)
+        second = self.manager.get_parameter_extraction_prompt("user: books on AI")
+        
+        assert first.endswith(conversation_text)
+        static_prefix = first[:-len(conversation_text)]
+        assert second.startswith(static_prefix)
+    
     def test_get_suggestion_prompt(self):
         """Test suggestion prompt generation."""
         query = "machine learning"
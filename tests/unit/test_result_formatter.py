@@ -2,7 +2,9 @@
 Unit tests for ResultFormatter service.
 Tests parsing and formatting logic without external dependencies.
 """
+import copy
 import pytest
+from unittest.mock import patch
 from core.services.result_formatter import ResultFormatter
 
 
@@ -63,6 +65,13 @@ class TestResultFormatter:
         assert "docid=TN_test123" in result["link"]
         assert "context=L" in result["link"]
     
+    def test_parse_document_link_matches_template_for_any_context(self):
+        """Precomputed link prefixes produce the same URL as the full template."""
+        for context in ("L", "PC", "XY"):
+            doc = dict(self.mock_doc, context=context)
+            expected = ResultFormatter._LINK_TEMPLATE.format(context=context, docid="TN_test123")
+            assert ResultFormatter.parse_document(doc)["link"] == expected
+    
     def test_parse_document_missing_fields(self):
         """Test parsing with missing fields."""
         minimal_doc = {"pnx": {"display": {}, "sort": {}, "addata": {}, "control": {}}}
@@ -72,6 +81,12 @@ class TestResultFormatter:
         assert result["author"] == "N/A"
         assert result["date"] == "N/A"
     
+    def test_parse_document_year_not_leading(self):
+        """Years are still found when the date does not start with them."""
+        for raw, expected in (("c2019", "2019"), ("Spring 2020", "2020"), ("n.d.", "n.d.")):
+            doc = {"pnx": {"sort": {"creationdate": [raw]}}}
+            assert ResultFormatter.parse_document(doc)["date"] == expected
+    
     def test_filter_by_resource_type_article(self):
         """Test filtering by article type."""
         docs = [self.mock_doc]
@@ -86,6 +101,45 @@ class TestResultFormatter:
         
         assert len(filtered) == 0  # Mock doc is an article
     
+    def test_build_table_filters_and_formats_in_one_pass(self):
+        """build_table matches filter-then-format and parses only the kept docs, once."""
+        book_doc = copy.deepcopy(self.mock_doc)
+        book_doc["pnx"]["display"]["type"] = ["book"]
+        docs = [book_doc, self.mock_doc]
+        
+        with patch.object(ResultFormatter, "parse_document", wraps=ResultFormatter.parse_document) as mock_parse:
+            table_data = ResultFormatter.build_table(docs, "article")
+        
+        mock_parse.assert_called_once_with(self.mock_doc)
+        assert table_data == ResultFormatter.format_table_data(
+            ResultFormatter.filter_by_resource_type(docs, "article")
+        )
+        assert [row["#"] for row in table_data] == [1]
+        assert len(ResultFormatter.build_table(docs)) == 2
+    
+    def test_build_columns_matches_build_table(self):
+        """Columnar output holds the same values as the row-wise table."""
+        no_link_doc = copy.deepcopy(self.mock_doc)
+        no_link_doc["pnx"]["control"] = {}
+        docs = [self.mock_doc, no_link_doc]
+        
+        columns = ResultFormatter.build_columns(docs)
+        rows = ResultFormatter.build_table(docs)
+        
+        assert list(columns) == list(rows[0])
+        for name, values in columns.items():
+            assert values == [row[name] for row in rows]
+        assert ResultFormatter.build_columns(docs, "book")["Title"] == []
+    
+    def test_filter_by_resource_type_skips_full_parse(self):
+        """Filtering reads only the type field, including when it is missing."""
+        untyped_doc = {"pnx": {"display": {}}}
+        with patch.object(ResultFormatter, "parse_document") as mock_parse:
+            filtered = ResultFormatter.filter_by_resource_type([self.mock_doc, untyped_doc], "article")
+        
+        mock_parse.assert_not_called()
+        assert filtered == [self.mock_doc]
+    
     def test_format_table_data(self):
         """Test table data formatting."""
         docs = [self.mock_doc]
@@ -100,7 +154,6 @@ class TestResultFormatter:
     
     def test_format_table_data_with_long_text(self):
         """Test table formatting with long titles and authors."""
-        import copy
         long_title_doc = copy.deepcopy(self.mock_doc)
         long_title_doc["pnx"]["display"]["title"] = ["A" * 100]
         long_title_doc["pnx"]["display"]["creator"] = ["B" * 50]
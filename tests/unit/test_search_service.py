@@ -0,0 +1,106 @@
+"""
+Unit tests for SearchService.
+Uses a mock library client to test without external API calls.
+"""
+from unittest.mock import Mock
+
+from core.interfaces import ILibraryClient
+from core.services import search_service
+from core.services.search_service import SearchService
+
+
+class TestSearchService:
+    """Unit tests for SearchService class."""
+
+    def setup_method(self):
+        """Setup test fixtures with mocks."""
+        self.mock_client = Mock(spec=ILibraryClient)
+        self.mock_client.search.return_value = {"docs": [{"id": 1}], "info": {"total": 1}}
+        self.service = SearchService(self.mock_client)
+
+        # Results are cached across instances; start each test clean
+        SearchService._results_cache.clear()
+
+    def test_search_cached_for_same_parameters(self):
+        """Repeating a search reuses the results, as an independent copy."""
+        first = self.service.search("machine learning", limit=5)
+        first["docs"].clear()
+        second = SearchService(self.mock_client).search("machine learning", limit=5)
+
+        assert second == {"docs": [{"id": 1}], "info": {"total": 1}}
+        self.mock_client.search.assert_called_once()
+
+    def test_search_different_parameters_not_shared(self):
+        """Any change in the search parameters goes back to the client."""
+        self.service.search("machine learning", limit=5)
+        self.service.search("machine learning", limit=5, resource_type="book")
+
+        assert self.mock_client.search.call_count == 2
+
+    def test_search_cache_not_shared_between_clients(self):
+        """Clients of the same class never receive each other's results."""
+        other_client = Mock(spec=ILibraryClient)
+        other_client.search.return_value = {"docs": [{"id": 2}], "info": {"total": 1}}
+
+        self.service.search("machine learning", limit=5)
+        other = SearchService(other_client).search("machine learning", limit=5)
+
+        assert other == {"docs": [{"id": 2}], "info": {"total": 1}}
+        other_client.search.assert_called_once()
+
+    def test_search_client_without_weakref_support(self):
+        """Clients that cannot be weakly referenced still get results, just uncached."""
+        class SlottedClient:
+            __slots__ = ()
+            calls = []
+
+            def search(self, query, limit=10, offset=0, resource_type=None, date_from=None, date_to=None):
+                SlottedClient.calls.append(query)
+                return {"docs": [{"id": 3}], "info": {"total": 1}}
+
+        service = SearchService(SlottedClient())
+
+        assert service.search("ethics") == {"docs": [{"id": 3}], "info": {"total": 1}}
+        assert service.search("ethics") == {"docs": [{"id": 3}], "info": {"total": 1}}
+        assert SlottedClient.calls == ["ethics", "ethics"]
+
+    def test_search_failures_not_cached(self):
+        """Errors return None and the next attempt retries the client."""
+        self.mock_client.search.side_effect = [RuntimeError("down"), {"docs": []}]
+
+        assert self.service.search("ethics") is None
+        assert self.service.search("ethics") == {"docs": []}
+
+    def test_parse_results(self):
+        """parse_results parses every document and tolerates missing docs."""
+        results = {"docs": [{"pnx": {"display": {"title": ["A"]}}}, {"pnx": {}}]}
+
+        parsed = self.service.parse_results(results)
+
+        assert len(parsed) == 2
+        assert parsed[0]["title"] == "A"
+        assert self.service.parse_results({}) == []
+
+
+def test_legacy_search_reuses_one_client(monkeypatch):
+    """perform_library_search builds the library client once until reset."""
+    created = []
+
+    def fake_client():
+        client = Mock(spec=ILibraryClient)
+        client.search.return_value = None
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(search_service, "CSUSBLibraryClient", fake_client)
+    search_service.reset_client()
+    try:
+        search_service.perform_library_search("ethics")
+        search_service.perform_library_search("law")
+        assert len(created) == 1
+
+        search_service.reset_client()
+        search_service.perform_library_search("ethics")
+        assert len(created) == 2
+    finally:
+        search_service.reset_client()
@@ -18,6 +18,9 @@ class TestSuggestionService:
         self.mock_prompts.get_suggestion_prompt.return_value = "Suggest alternatives"
         
         self.service = SuggestionService(self.mock_llm, self.mock_prompts)
+        
+        # Suggestions are cached across instances; start each test clean
+        SuggestionService._suggestion_cache.clear()
     
     def test_generate_suggestions_success(self):
         """Test successful suggestion generation."""
@@ -29,6 +32,16 @@ class TestSuggestionService:
         assert result == expected_suggestions
         self.mock_llm.chat.assert_called_once()
     
+    def test_generate_suggestions_cached_for_same_query(self):
+        """Repeats of a query, ignoring case and spacing, reuse the first answer."""
+        self.mock_llm.chat.return_value = "- customer churn\n"
+        
+        first = self.service.generate_suggestions("OTT churn causes")
+        second = SuggestionService(self.mock_llm, self.mock_prompts).generate_suggestions("  ott  churn causes ")
+        
+        assert first == second == "- customer churn"
+        self.mock_llm.chat.assert_called_once()
+    
     def test_generate_suggestions_error_fallback(self):
         """Test fallback when suggestion generation fails."""
         self.mock_llm.chat.side_effect = Exception("API Error")
@@ -38,6 +51,12 @@ class TestSuggestionService:
         assert "broader search terms" in result.lower()
         assert result.startswith("-")
     
+    def test_generate_suggestions_non_string_query_falls_back(self):
+        """A None query returns the fallback suggestions instead of raising."""
+        result = self.service.generate_suggestions(None)
+        
+        assert result == self.service._format_fallback_suggestions()
+    
     def test_default_suggestions_constant(self):
         """Test that default suggestions are defined."""
         assert len(SuggestionService.DEFAULT_SUGGESTIONS) > 0
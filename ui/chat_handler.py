@@ -1,6 +1,9 @@
 # ui/chat_handler.py
+import itertools
+import threading
+import time
 import streamlit as st
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 from core.clients.groq_client import GroqClient
 from core.services.conversation_analyzer import ConversationAnalyzer
 from core.services.suggestion_service import SuggestionService
@@ -11,6 +14,8 @@ from ui.theme import get_assistant_avatar, get_user_avatar
 
 logger = get_logger(__name__)
 
+READY_SIGNAL = "READY_TO_SEARCH"
+
 # Initialize Groq client
 def initialize_groq_client() -> Optional[GroqClient]:
     """Initialize the Groq client for LLM interactions."""
@@ -50,6 +55,10 @@ class ChatOrchestrator:
         """Get AI response for continuing conversation."""
         return self.analyzer.get_follow_up_response(conversation_history)
     
+    def stream_conversation_response(self, conversation_history: list) -> Iterator[str]:
+        """Stream AI response for continuing conversation."""
+        return self.analyzer.stream_follow_up_response(conversation_history)
+    
     def execute_search(self, conversation_history: list):
         """Execute search and handle results."""
         # Extract parameters - pass previous params for refinement detection
@@ -115,9 +124,6 @@ class ChatOrchestrator:
         self._display_search_message(search_query, limit, resource_type)
 
         # Perform search with progress bar
-        import time
-        import threading
-        
         progress_text = "Searching library database..."
         progress_bar = st.progress(0, text=progress_text)
         
@@ -228,6 +234,58 @@ class ChatOrchestrator:
         st.session_state.messages.append({"role": "assistant", "content": message})
 
 
+def _read_until_ready_signal(chunks: Iterator[str]) -> Tuple[str, Iterator[str]]:
+    """
+    Buffer just enough of a streamed reply to tell whether it is READY_TO_SEARCH.
+    Returns the buffered head and the iterator positioned after it.
+    """
+    head = ""
+    for chunk in chunks:
+        head += chunk
+        stripped = head.lstrip().strip('"')
+        if len(stripped) >= len(READY_SIGNAL) or not READY_SIGNAL.startswith(stripped):
+            break
+    return head, chunks
+
+
+class _ReadySignalFilter:
+    """
+    Iterate over a streamed reply with READY_TO_SEARCH kept off the screen.
+    Any tail that could still grow into the signal is held back until the next
+    chunk rules it out; once the signal appears the stream is closed, `ready`
+    is set and only the text before it has been yielded.
+    """
+
+    def __init__(self, head: str, chunks: Iterator[str]):
+        self._head = head
+        self._chunks = chunks
+        self.ready = False
+
+    def __iter__(self) -> Iterator[str]:
+        pending = self._head
+        for chunk in itertools.chain([""], self._chunks):
+            pending += chunk
+            idx = pending.find(READY_SIGNAL)
+            if idx != -1:
+                self.ready = True
+                self._chunks.close()  # Stop generating tokens nobody will read
+                pending = pending[:idx].rstrip().rstrip('"')
+                break
+            # Hold back the longest tail that is a prefix of the signal, plus
+            # any quotes or spaces in front of it that would be stripped with it
+            keep = next(
+                (k for k in range(min(len(pending), len(READY_SIGNAL) - 1), 0, -1)
+                 if pending.endswith(READY_SIGNAL[:k])),
+                0,
+            )
+            safe = len(pending[:len(pending) - keep].rstrip().rstrip('"'))
+            if safe:
+                yield pending[:safe]
+                pending = pending[safe:]
+        if pending:
+            yield pending
+
+
 def handle_user_message(prompt: str, groq_client: GroqClient):
     """
     Handle user message and generate appropriate response.
@@ -288,9 +346,6 @@ def handle_user_message(prompt: str, groq_client: GroqClient):
 
     # Process message
     with st.chat_message("assistant", avatar=get_assistant_avatar()):
-        import time
-        import threading
-        
         conversation_history = st.session_state.messages.copy()
         
         # Check if this is a metadata question that should get a special response
@@ -334,45 +389,28 @@ def handle_user_message(prompt: str, groq_client: GroqClient):
             orchestrator.execute_search(conversation_history)
             return
         
-        # Show progress bar while getting AI response
-        progress_text = "Thinking..."
-        progress_bar = st.progress(0, text=progress_text)
-        
-        # Thread-safe storage for AI response
-        response_data = {"done": False, "response": None}
-        
-        def get_ai_response():
-            response_data["response"] = orchestrator.get_conversation_response(conversation_history)
-            response_data["done"] = True
-        
-        # Start AI processing in background thread
-        response_thread = threading.Thread(target=get_ai_response)
-        response_thread.start()
-        
-        # Animate progress bar while AI is thinking
-        progress = 0
-        while not response_data["done"]:
-            progress = min(progress + 15, 85)  # Cap at 85% until complete
-            progress_bar.progress(progress, text=progress_text)
-            time.sleep(0.15)
-        
-        # Complete the progress bar
-        progress_bar.progress(100, text="Done!")
-        response_thread.join()
-        time.sleep(0.2)  # Brief pause to show completion
-        progress_bar.empty()  # Remove progress bar
-        
-        ai_response = response_data["response"]
-        logger.info(f"AI response: {ai_response}")
+        # Stream the AI response; hold back only the first tokens until we know
+        # whether the model is signalling READY_TO_SEARCH
+        stream = orchestrator.stream_conversation_response(conversation_history)
+        with st.spinner("Thinking..."):
+            head, stream = _read_until_ready_signal(stream)
 
         # Check if ready to search
-        if "READY_TO_SEARCH" in ai_response:
+        if READY_SIGNAL in head:
+            stream.close()  # Stop generating tokens nobody will read
             logger.info("AI indicated READY_TO_SEARCH - executing search")
             orchestrator.execute_search(conversation_history)
         else:
+            visible = _ReadySignalFilter(head, stream)
+            ai_response = st.write_stream(visible)
+            logger.info(f"AI response: {ai_response}")
+            if visible.ready:
+                # Signal arrived after some preamble text
+                logger.info("AI indicated READY_TO_SEARCH - executing search")
+                orchestrator.execute_search(conversation_history)
+                return
             # Continue conversation (ask for clarification)
             logger.info(f"AI continuing conversation with follow-up question")
-            st.markdown(ai_response)
             st.session_state.messages.append({"role": "assistant", "content": ai_response})
 
 
@@ -62,8 +62,8 @@ def display_results_table(results: Dict[str, Any]):
     # Show info about results
     _display_result_count(len(docs), total_available)
     
-    # Format data for table using ResultFormatter
-    table_data = ResultFormatter.format_table_data(docs)
+    # Format data for table using ResultFormatter, column by column
+    table_data = ResultFormatter.build_columns(docs)
     
     # Display as dataframe with proper configuration
     st.dataframe(